@@ -0,0 +1,111 @@
+"""
+Headless playback benchmark and regression check for the audio backends.
+
+Times the play() call of the null and WAV sink backends (the PTB backend
+too when PsychoPy is installed), then drives a WavSinkBackend with a
+simulated clock through a repeat-rate session (target and reference sounds,
+volume changes) and checks the recording against the log: every play must
+appear in the WAV at its logged frame as the stimulus times its volume,
+faded in by the mixer.
+
+Usage:
+    python benchmarks/backend_playback.py [--plays 1000] [--output FILE]
+"""
+
+import argparse
+import csv
+import os
+import sys
+import tempfile
+import time
+
+import numpy as np
+
+UTILS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "utils")
+TONES_DIR = os.path.join(UTILS_DIR, "..", "tones")
+sys.path.insert(0, UTILS_DIR)
+
+from audio_backend import NullBackend, PTBBackend, WavSinkBackend  # noqa: E402
+from wav_io import read_wav  # noqa: E402
+
+FS = 48000
+SOUNDS = {f"tone_{i}": os.path.join(TONES_DIR, f"tone_{i}.wav") for i in range(4)}
+REFERENCE = os.path.join(TONES_DIR, "tone_13.wav")
+
+
+def time_plays(backend, n_plays):
+    """Mean wall time of backend.play in microseconds."""
+    backend.load(dict(SOUNDS, reference=REFERENCE))
+    names = list(SOUNDS)
+    start_time = time.perf_counter()
+    for i in range(n_plays):
+        backend.play(names[i % len(names)], 0.5)
+    elapsed = time.perf_counter() - start_time
+    return elapsed / n_plays * 1e6
+
+
+class SteppedClock:
+    """Clock that advances only when told to."""
+
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def check_recording(path):
+    """Replay a session into a WAV sink and compare each play with its log entry."""
+    clock = SteppedClock()
+    backend = WavSinkBackend(path, FS, clock=clock)
+    backend.load(dict(SOUNDS, reference=REFERENCE))
+    rng = np.random.default_rng(0)
+    for _ in range(50):
+        name = "reference" if rng.random() < 0.3 else f"tone_{rng.integers(4)}"
+        backend.play(name, float(rng.uniform(0.05, 0.5)))
+        # The repeat interval (1 s at repeat_rate 1.0) with some jitter
+        clock.now += rng.uniform(0.2, 1.0)
+    backend.close()
+
+    recorded, _ = read_wav(path)
+    with open(backend.log_path, newline="") as log_file:
+        plays = [row for row in csv.DictReader(log_file) if row["Event"] == "play"]
+    worst = 0.0
+    for row in plays:
+        buffer = backend.mixer.voice_output(
+            backend.buffers[row["Name"]], float(row["Volume"])
+        )
+        frame = int(row["Frame"])
+        segment = recorded[frame : frame + len(buffer)]
+        worst = max(worst, np.max(np.abs(segment - buffer)))
+    return len(plays), worst
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--plays", type=int, default=1000)
+    parser.add_argument("--output", default=None)
+    args = parser.parse_args()
+
+    directory = tempfile.mkdtemp()
+    print(f"null: {time_plays(NullBackend(FS), args.plays):.2f} us per play")
+    sink = WavSinkBackend(os.path.join(directory, "timing.wav"), FS)
+    print(f"wav sink: {time_plays(sink, args.plays):.2f} us per play")
+    try:
+        print(f"ptb: {time_plays(PTBBackend(FS), args.plays):.2f} us per play")
+    except ImportError:
+        print("ptb: skipped (PsychoPy not installed)")
+
+    output = args.output or os.path.join(directory, "session.wav")
+    n_plays, worst = check_recording(output)
+    # 16-bit quantisation of the recording
+    tolerance = 2 / 32767
+    print(f"{n_plays} plays recorded to {output}, largest error {worst:.2e}")
+    failed = worst > tolerance
+    if failed:
+        print("FAIL: recording does not match the log")
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == "__main__":
+    main()
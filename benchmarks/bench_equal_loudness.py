@@ -0,0 +1,218 @@
+"""
+Benchmark suite for iso226 / normalize_loudness_direct.
+
+Three parts, all offline:
+  grid     timing sweep over 1, 31, 1e3 and 1e6 frequencies x 1, 10 and 1e3 phon levels
+  paths    fq=None table path vs the interpolated path, with and without >12.5 kHz
+           extrapolation
+  memory   tracemalloc peak of one call for every grid size
+
+Results are written as JSON (one record per case) so that runs from different
+commits can be compared with --compare.
+
+Usage:
+    python benchmarks/bench_equal_loudness.py [--output FILE] [--compare OLD.json]
+        [--max-cells N] [--min-time SECONDS]
+"""
+
+import argparse
+import contextlib
+import io
+import json
+import os
+import platform
+import subprocess
+import sys
+import timeit
+import tracemalloc
+
+import numpy as np
+
+UTILS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "utils")
+sys.path.insert(0, UTILS_DIR)
+
+from equal_loudness_contor_2023ISO_params import (  # noqa: E402
+    iso226,
+    normalize_loudness_direct,
+)
+
+FREQUENCY_COUNTS = [1, 31, 1000, 1000000]
+PHON_COUNTS = [1, 10, 1000]
+
+
+def _quiet(function, *args, **kwargs):
+    # iso226 prints range warnings; keep them out of the report
+    with contextlib.redirect_stdout(io.StringIO()):
+        return function(*args, **kwargs)
+
+
+def _frequencies(n, f_max=12500.0):
+    return np.geomspace(20.0, f_max, n) if n > 1 else np.array([1000.0])
+
+
+def _phon_levels(n):
+    return np.linspace(20.0, 80.0, n) if n > 1 else np.array([60.0])
+
+
+def time_call(function, min_time):
+    """Best time per call in seconds, over 5 repeats of an autoranged loop."""
+    timer = timeit.Timer(lambda: _quiet(function))
+    number, _ = timer.autorange()
+    number = max(1, int(number * min_time / 0.2))
+    return min(timer.repeat(repeat=5, number=number)) / number
+
+
+def peak_memory(function):
+    """Peak traced allocation (bytes) during one call."""
+    tracemalloc.start()
+    tracemalloc.reset_peak()
+    _quiet(function)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return peak
+
+
+def bench_grid(max_cells, min_time):
+    results = []
+    for n_freq in FREQUENCY_COUNTS:
+        for n_phon in PHON_COUNTS:
+            fq = _frequencies(n_freq)
+            phon = _phon_levels(n_phon)
+            for name, function in (
+                ("iso226", lambda: iso226(phon, fq)),
+                (
+                    "normalize_loudness_direct",
+                    lambda: normalize_loudness_direct(phon, fq),
+                ),
+            ):
+                record = {
+                    "part": "grid",
+                    "case": f"{name}[{n_freq}x{n_phon}]",
+                    "n_freq": n_freq,
+                    "n_phon": n_phon,
+                }
+                if n_freq * n_phon > max_cells:
+                    record["skipped"] = f"more than {max_cells} cells"
+                else:
+                    record["seconds"] = time_call(function, min_time)
+                results.append(record)
+                print(_format(record))
+    return results
+
+
+def bench_paths(min_time):
+    phon = _phon_levels(10)
+    cases = {
+        "table (fq=None)": lambda: iso226(phon),
+        "interpolated, <=12.5 kHz": lambda: iso226(phon, _frequencies(31)),
+        "interpolated, extrapolated to 18 kHz": lambda: iso226(
+            phon, _frequencies(31, f_max=18000.0)
+        ),
+    }
+    results = []
+    for case, function in cases.items():
+        record = {
+            "part": "paths",
+            "case": case,
+            "seconds": time_call(function, min_time),
+        }
+        results.append(record)
+        print(_format(record))
+    return results
+
+
+def bench_memory(max_cells):
+    results = []
+    for n_freq in FREQUENCY_COUNTS:
+        for n_phon in PHON_COUNTS:
+            record = {
+                "part": "memory",
+                "case": f"iso226[{n_freq}x{n_phon}]",
+                "n_freq": n_freq,
+                "n_phon": n_phon,
+            }
+            if n_freq * n_phon > max_cells:
+                record["skipped"] = f"more than {max_cells} cells"
+            else:
+                fq = _frequencies(n_freq)
+                phon = _phon_levels(n_phon)
+                record["peak_bytes"] = peak_memory(lambda: iso226(phon, fq))
+                # Bytes of the returned spl array, for scale
+                record["output_bytes"] = n_freq * n_phon * 8
+            results.append(record)
+            print(_format(record))
+    return results
+
+
+def _format(record):
+    if "skipped" in record:
+        return f"{record['part']:7s} {record['case']:55s} skipped ({record['skipped']})"
+    if "seconds" in record:
+        return f"{record['part']:7s} {record['case']:55s} {record['seconds'] * 1e6:14.1f} us"
+    return f"{record['part']:7s} {record['case']:55s} {record['peak_bytes'] / 2**20:14.2f} MiB peak"
+
+
+def _git_commit():
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            cwd=UTILS_DIR,
+            capture_output=True,
+            text=True,
+            check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def compare(results, old_path):
+    """Print new/old ratios for every case present in both runs."""
+    with open(old_path) as old_file:
+        old = {(r["part"], r["case"]): r for r in json.load(old_file)["results"]}
+    print(f"\nCompared with {old_path} (ratio > 1 is slower / larger):")
+    for record in results:
+        previous = old.get((record["part"], record["case"]))
+        for field in ("seconds", "peak_bytes"):
+            if previous and field in record and field in previous:
+                ratio = record[field] / previous[field]
+                print(f"{record['part']:7s} {record['case']:55s} {ratio:6.2f}x")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--output", default="bench_equal_loudness.json")
+    parser.add_argument("--compare", help="previous JSON result file")
+    parser.add_argument(
+        "--max-cells",
+        type=int,
+        default=20_000_000,
+        help="skip grid sizes with more frequency x phon cells (1e6 x 1e3 needs ~8 GB per array)",
+    )
+    parser.add_argument(
+        "--min-time", type=float, default=0.2, help="seconds per timing repeat"
+    )
+    args = parser.parse_args()
+
+    results = (
+        bench_grid(args.max_cells, args.min_time)
+        + bench_paths(args.min_time)
+        + bench_memory(args.max_cells)
+    )
+
+    report = {
+        "commit": _git_commit(),
+        "python": platform.python_version(),
+        "numpy": np.__version__,
+        "machine": platform.machine(),
+        "results": results,
+    }
+    with open(args.output, "w") as output_file:
+        json.dump(report, output_file, indent=2)
+    print(f"\nWrote {args.output}")
+
+    if args.compare:
+        compare(results, args.compare)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,141 @@
+"""
+Regression check that the calibrated modules agree with the contour model.
+
+Checks:
+  - loudness_estimator: a 1 kHz tone played at the volume
+    normalize_loudness_direct returns for L phon reads L +- 1 phon
+  - device_calibration: the volume for a measured SPL is the reference volume,
+    and a flat measurement of volume_to_spl(a, a, b) reproduces the (a, b)
+    volumes of normalize_loudness_direct
+  - contour tables: iso226 at a frequency does not depend on the other
+    frequencies of the call, and ContourTable and the stimulus table agree
+    with it at the tone frequencies; ContourTable rejects NaN phon levels and
+    non-positive frequencies
+  - loudness_compensation_filter: up to 12.5 kHz the gains of a full design
+    grid are the iso226 level differences at each frequency on its own
+
+Usage:
+    python benchmarks/calibration_check.py
+"""
+
+import os
+import sys
+import tempfile
+
+import numpy as np
+
+UTILS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "utils")
+sys.path.insert(0, UTILS_DIR)
+
+from contour_table import ContourTable, build_contour_table  # noqa: E402
+from device_calibration import DeviceCalibration  # noqa: E402
+from equal_loudness_contor_2023ISO_params import (  # noqa: E402
+    iso226,
+    normalize_loudness_direct,
+    volume_to_spl,
+)
+from loudness_compensation_filter import compensation_gain_db  # noqa: E402
+from loudness_estimator import loudness_stationary  # noqa: E402
+from stimulus_table import build_stimulus_table, read_tones_metadata  # noqa: E402
+
+FS = 48000
+METADATA = os.path.join(UTILS_DIR, "..", "tones", "tones_metadata.csv")
+
+
+def check_estimator(failures):
+    """Loudness level of 1 kHz tones at the model volumes for 40, 60 and 80 phon."""
+    tone = np.sin(2 * np.pi * 1000 * np.arange(FS) / FS)
+    for phon in (40.0, 60.0, 80.0):
+        volume, _ = normalize_loudness_direct(phon, fq=[1000.0])
+        _, measured, _ = loudness_stationary(tone, FS, float(np.ravel(volume)[0]))
+        print(
+            f"estimator: 1 kHz at the {phon:.0f}-phon volume reads {measured:.2f} phon"
+        )
+        if abs(measured - phon) > 1:
+            failures.append(f"estimator at {phon:.0f} phon")
+
+
+def check_device_calibration(failures):
+    """Round trip through DeviceCalibration.gain and agreement with a flat (a, b) device."""
+    rng = np.random.default_rng(0)
+    measured = np.geomspace(50, 16000, 12)
+    calibration = DeviceCalibration(
+        measured, rng.uniform(70, 90, len(measured)), reference_volume=0.2
+    )
+    fq = np.geomspace(100, 12500, 30)
+    volume = calibration.gain(fq) * 10 ** (calibration.spl_at(fq) / 20)
+    error = np.max(np.abs(volume - calibration.reference_volume))
+    print(f"device calibration: volume at the measured SPL off by {error:.1e}")
+    if error > 1e-12:
+        failures.append("device calibration round trip")
+
+    a, b = 0.34, 111.8
+    flat = DeviceCalibration(measured, np.full(len(measured), volume_to_spl(a, a, b)))
+    expected, _ = normalize_loudness_direct(60.0, fq=fq, a=a, b=b)
+    calibrated, _ = normalize_loudness_direct(60.0, fq=fq, calibration=flat)
+    error = np.max(np.abs(calibrated / expected - 1))
+    print(f"device calibration: flat device vs (a, b) relative error {error:.1e}")
+    if error > 1e-12:
+        failures.append("flat device calibration")
+
+
+def check_contour_tables(failures):
+    """SPL of ContourTable and the stimulus table against iso226 at the tone frequencies."""
+    filenames, frequencies = read_tones_metadata(METADATA)
+    frequencies = np.asarray(frequencies, dtype=float)
+    phon = np.arange(20.0, 81.0)
+    spl, _, _ = iso226(phon, fq=frequencies)
+    alone = np.stack([iso226(phon, fq=[f])[0][0] for f in frequencies])
+    table_path = os.path.join(tempfile.mkdtemp(), "contour_table.npy")
+    build_contour_table(table_path)
+    contour_table = ContourTable(table_path)
+    table = contour_table.spl(phon, frequencies[:, np.newaxis])
+    stimulus_table = build_stimulus_table(METADATA)
+    stimuli = np.array(
+        [[stimulus_table.spl(name, level) for level in phon] for name in filenames]
+    )
+    # ContourTable interpolates bilinearly on its grid
+    for label, values, tolerance in (
+        ("iso226 alone", alone, 1e-9),
+        ("ContourTable", table, 0.05),
+        ("stimulus table", stimuli, 1e-9),
+    ):
+        error = np.max(np.abs(values - spl))
+        print(f"contour tables: {label} vs iso226, largest error {error:.3f} dB")
+        if error > tolerance:
+            failures.append(f"{label} disagrees with iso226")
+
+    for phon_level, fq in ((np.nan, 1000.0), (60.0, np.nan), (60.0, 0.0)):
+        try:
+            contour_table.spl(phon_level, fq)
+        except ValueError:
+            continue
+        failures.append(f"ContourTable accepted phon {phon_level}, fq {fq}")
+
+
+def check_compensation_gain(failures):
+    """Compensation gains on an FIR design grid against iso226 per frequency."""
+    freqs = np.fft.rfftfreq(1 << 14, 1 / FS)
+    gain = compensation_gain_db(60.0, freqs, max_gain_db=np.inf)
+    in_range = np.flatnonzero((freqs >= 20) & (freqs <= 12500))[::40]
+    reference = iso226(60.0, fq=[1000.0])[0][0, 0]
+    expected = np.array([iso226(60.0, fq=[f])[0][0, 0] for f in freqs[in_range]])
+    error = np.max(np.abs(gain[in_range] - (expected - reference)))
+    print(f"compensation gain: largest error up to 12.5 kHz {error:.3f} dB")
+    if error > 1e-9:
+        failures.append("compensation gain disagrees with iso226")
+
+
+def main():
+    failures = []
+    check_estimator(failures)
+    check_device_calibration(failures)
+    check_contour_tables(failures)
+    check_compensation_gain(failures)
+    for failure in failures:
+        print("FAIL:", failure)
+    sys.exit(1 if failures else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,79 @@
+"""
+Import-time regression benchmark for the equal-loudness numeric core.
+
+Imports the module in fresh interpreters with `python -X importtime`, reports
+the best cumulative import time, and fails (exit code 1) if it exceeds the
+budget or if matplotlib / SciPy got pulled in at import time or by a first
+normalize_loudness_direct(fq=...) call (the first trial of an experiment).
+
+Usage:
+    python benchmarks/import_time.py [--budget-ms 150] [--repeat 5]
+"""
+
+import argparse
+import os
+import subprocess
+import sys
+
+UTILS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "utils")
+MODULE = "equal_loudness_contor_2023ISO_params"
+FORBIDDEN = ("matplotlib", "scipy")
+
+
+def measure_import(module):
+    """Cumulative import time of module in microseconds and the heavy packages it loaded."""
+    env = dict(os.environ, PYTHONPATH=UTILS_DIR)
+    code = (
+        f"import sys, {module}; "
+        f"{module}.normalize_loudness_direct(60, fq=[1000.0, 16000.0]); "
+        f"print(','.join(sorted({{m.split('.')[0] for m in sys.modules}})))"
+    )
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", code],
+        env=env,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+
+    cumulative_us = None
+    for line in result.stderr.splitlines():
+        # import time: self [us] | cumulative | imported package
+        fields = [field.strip() for field in line.split("|")]
+        if len(fields) == 3 and fields[2] == module:
+            cumulative_us = int(fields[1])
+
+    # The module list is the last line; the call may print warnings before it
+    loaded = set(result.stdout.strip().splitlines()[-1].split(","))
+    return cumulative_us, sorted(loaded.intersection(FORBIDDEN))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--budget-ms", type=float, default=150.0)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    timings = []
+    heavy = []
+    for _ in range(args.repeat):
+        cumulative_us, loaded = measure_import(MODULE)
+        timings.append(cumulative_us / 1000)
+        heavy = loaded or heavy
+
+    best_ms = min(timings)
+    print(f"{MODULE}: best {best_ms:.1f} ms over {args.repeat} runs")
+    print(f"budget: {args.budget_ms:.1f} ms")
+
+    failed = False
+    if heavy:
+        print("FAIL: imported at module load or first call:", ", ".join(heavy))
+        failed = True
+    if best_ms > args.budget_ms:
+        print("FAIL: import time over budget")
+        failed = True
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,147 @@
+"""
+Repeat and stop check of the mixer backend, the Linux default of VolumeAdjuster.
+
+Drives a WavSinkBackend (a MixerBackend whose mixer renders into a WAV file
+instead of a device stream) with a simulated clock, the way VolumeAdjuster
+does: hundreds of repeats of a test tone and a reference tone, then a long
+masker that is stopped part-way and a tone played after the stop. The
+recording is read back and checked:
+  - every repeat matches the first sample for sample, so the level cannot
+    drift however often a sound is replayed
+  - around the stop: full level up to the logged stop frame, a linear fade
+    to 0 over the mixer's ramp, then exact silence until the next play
+  - the play after the stop is the plain voice output again
+
+The mixer's render path is the one the device callback runs; what it does
+not cover is the device itself (a recording through a loopback device).
+
+Usage:
+    python benchmarks/mixer_backend_repeat.py [--repeats 300] [--output FILE]
+"""
+
+import argparse
+import csv
+import os
+import sys
+import tempfile
+
+import numpy as np
+
+UTILS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "utils")
+TONES_DIR = os.path.join(UTILS_DIR, "..", "tones")
+sys.path.insert(0, UTILS_DIR)
+
+from audio_backend import WavSinkBackend  # noqa: E402
+from wav_io import read_wav  # noqa: E402
+
+FS = 48000
+# 16-bit quantisation of the recording
+TOLERANCE = 2 / 32767
+
+
+class SteppedClock:
+    """Clock that advances only when told to."""
+
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def run_session(path, repeats):
+    clock = SteppedClock()
+    backend = WavSinkBackend(path, FS, clock=clock)
+    backend.load(
+        {
+            "tone_5": os.path.join(TONES_DIR, "tone_5.wav"),
+            "reference": os.path.join(TONES_DIR, "tone_13.wav"),
+            "noise": os.path.join(TONES_DIR, "noise.wav"),
+        }
+    )
+    volumes = {"tone_5": 0.5, "reference": 0.1}
+    for i in range(repeats):
+        name = "tone_5" if i % 3 else "reference"
+        backend.play(name, volumes[name])
+        clock.now += 0.1
+
+    backend.play("noise", 0.3)
+    clock.now += 0.5
+    backend.stop()
+    clock.now += 0.3
+    backend.play("tone_5", 0.5)
+    backend.close()
+    return backend
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--repeats", type=int, default=300)
+    parser.add_argument("--output", default=None)
+    args = parser.parse_args()
+
+    output = args.output or os.path.join(tempfile.mkdtemp(), "mixer_repeat.wav")
+    backend = run_session(output, args.repeats)
+    mixer = backend.mixer
+    recorded, _ = read_wav(output)
+    with open(backend.log_path, newline="") as log_file:
+        events = list(csv.DictReader(log_file))
+    failures = []
+
+    plays = [row for row in events if row["Event"] == "play"]
+    for name in ("tone_5", "reference"):
+        rows = [row for row in plays[: args.repeats] if row["Name"] == name]
+        length = len(backend.buffers[name])
+        segments = np.stack(
+            [recorded[int(row["Frame"]) : int(row["Frame"]) + length] for row in rows]
+        )
+        worst = np.max(np.abs(segments - segments[0]))
+        expected = mixer.voice_output(backend.buffers[name], float(rows[0]["Volume"]))
+        worst = max(worst, np.max(np.abs(segments[0] - expected)))
+        print(f"{name}: {len(rows)} repeats, largest difference {worst:.2e}")
+        if worst > TOLERANCE:
+            failures.append(f"{name} changed across repeats")
+
+    # The stop takes effect at the frame logged for it
+    noise_start = int(plays[args.repeats]["Frame"])
+    stop = int(next(row for row in events if row["Event"] == "stop")["Frame"])
+    after = plays[args.repeats + 1]
+    next_play = int(after["Frame"])
+    ramp = mixer.ramp_samples
+    noise = mixer.voice_output(backend.buffers["noise"], 0.3)[
+        : stop + ramp - noise_start
+    ]
+    fade = np.ones(len(noise))
+    fade[stop - noise_start :] = 1 - np.arange(1, ramp + 1) / ramp
+    checks = (
+        ("before the stop", recorded[noise_start:stop], noise[: stop - noise_start]),
+        (
+            "fade-out",
+            recorded[stop : stop + ramp],
+            (noise * fade)[stop - noise_start :],
+        ),
+        (
+            "after the fade",
+            recorded[stop + ramp : next_play],
+            np.zeros(next_play - stop - ramp),
+        ),
+    )
+    for label, segment, expected in checks:
+        error = np.max(np.abs(segment - expected))
+        print(f"stop, {label}: {len(segment)} frames, largest error {error:.2e}")
+        if error > TOLERANCE:
+            failures.append(f"output {label} does not match")
+
+    expected = mixer.voice_output(backend.buffers["tone_5"], float(after["Volume"]))
+    error = np.max(np.abs(recorded[next_play : next_play + len(expected)] - expected))
+    print(f"play after the stop: largest error {error:.2e}")
+    if error > TOLERANCE:
+        failures.append("play after the stop does not match")
+
+    for failure in failures:
+        print("FAIL:", failure)
+    sys.exit(1 if failures else 0)
+
+
+if __name__ == "__main__":
+    main()
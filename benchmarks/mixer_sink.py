@@ -0,0 +1,86 @@
+"""
+Click and throughput check for the output mixer against a file sink.
+
+Renders a session of overlapping, re-gained, stolen and stopped voices
+through FileSinkOutput and checks that no gain change produces a jump
+larger than one ramp step (voices are constant buffers, so every jump in
+the output comes from the mixer), then times Mixer.render at full voice
+load and reports it as a fraction of the block's real-time budget.
+
+Usage:
+    python benchmarks/mixer_sink.py [--block-size 256] [--max-voices 8]
+        [--output FILE]
+"""
+
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+
+UTILS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "utils")
+sys.path.insert(0, UTILS_DIR)
+
+from output_mixer import FileSinkOutput, Mixer  # noqa: E402
+
+FS = 48000
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--block-size", type=int, default=256)
+    parser.add_argument("--max-voices", type=int, default=8)
+    parser.add_argument("--output", default=None)
+    args = parser.parse_args()
+
+    mixer = Mixer(FS, max_voices=args.max_voices)
+    sink = FileSinkOutput(mixer, args.output, block_size=args.block_size)
+    # A constant buffer that starts and ends with the mixer's own ramp
+    ramp = np.linspace(0, 1, mixer.ramp_samples, dtype=np.float32)
+    dc = np.concatenate([ramp, np.ones(FS, np.float32), ramp[::-1]])
+    rng = np.random.default_rng(0)
+    voices = []
+    for _ in range(200):
+        action = rng.integers(3)
+        if action == 0 or not voices:
+            voices.append(mixer.play(dc, gain=0.05))
+        elif action == 1:
+            mixer.set_gain(voices[rng.integers(len(voices))], rng.uniform(0.01, 0.1))
+        else:
+            mixer.stop(voices.pop(rng.integers(len(voices))))
+        sink.advance(int(rng.integers(1, 4)) * args.block_size)
+    mixer.stop()
+    sink.advance(FS // 10)
+    sink.close()
+
+    output = sink.samples()[:, 0].astype(float)
+    largest_jump = np.max(np.abs(np.diff(output)))
+    # Worst case: every voice ramps by its full gain range in the same sample
+    allowed = args.max_voices * 2 * 0.1 / mixer.ramp_samples
+
+    block = np.empty((args.block_size, 1), dtype=np.float32)
+    for _ in range(args.max_voices):
+        mixer.play(np.ones(60 * FS, np.float32), gain=0.1)
+    mixer.render(block)
+    n_blocks = 2000
+    start_time = time.perf_counter()
+    for _ in range(n_blocks):
+        mixer.render(block)
+    render_us = (time.perf_counter() - start_time) / n_blocks * 1e6
+    budget_us = args.block_size / FS * 1e6
+
+    print(f"{sink.frames} frames rendered, {mixer.steals} voices stolen")
+    print(f"largest sample-to-sample jump {largest_jump:.5f} (allowed {allowed:.5f})")
+    print(
+        f"render: {render_us:.1f} us per {args.block_size}-frame block with "
+        f"{args.max_voices} voices ({100 * render_us / budget_us:.1f}% of real time)"
+    )
+    failed = largest_jump > allowed
+    if failed:
+        print("FAIL: gain change produced a click")
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == "__main__":
+    main()
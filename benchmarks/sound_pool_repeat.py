@@ -0,0 +1,145 @@
+"""
+Repeat-playback check for SoundPool against a file sink.
+
+Plays stimuli hundreds of times through a SoundPool whose slots render into
+a WAV file instead of an audio device, alternating between a test tone and
+a reference tone the way VolumeAdjuster does. The file is read back and
+every play is measured: the level must not drift from the first play, and
+every play must start at sample 0. The per-play cost is compared with the
+old Linux path (decode the file and build a new Sound for every play).
+
+The sink slots keep a playhead and a volume like a real stream, so a slot
+that is not rewound or not given its volume again fails the check. They are
+mocks, though: this tests the pool's reset logic only and cannot detect the
+PTB/ALSA volume decay, which needs a recording of real Sounds through a
+loopback device. Until that exists the pool stays opt-in on Linux.
+
+Usage:
+    python benchmarks/sound_pool_repeat.py [--repeats 500] [--output FILE]
+        [--tolerance-db 0.01]
+"""
+
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+import numpy as np
+
+UTILS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "utils")
+TONES_DIR = os.path.join(UTILS_DIR, "..", "tones")
+sys.path.insert(0, UTILS_DIR)
+
+from sound_pool import SoundPool  # noqa: E402
+from wav_io import read_wav, write_wav  # noqa: E402
+
+FS = 48000
+GAP = 480  # silence between plays in the sink, in samples
+
+
+class FileSink:
+    """Collects what the slots play, one fixed-length period per play."""
+
+    def __init__(self, period):
+        self.period = period
+        self.plays = []
+        self.constructed = 0
+
+    def factory(self, buffer, sample_rate, volume):
+        self.constructed += 1
+        return SinkSound(self, buffer, volume)
+
+    def write(self, path, fs):
+        out = np.zeros(len(self.plays) * self.period, dtype=np.float32)
+        for i, samples in enumerate(self.plays):
+            out[i * self.period : i * self.period + len(samples)] = samples
+        write_wav(path, out, fs)
+
+
+class SinkSound:
+    """Sound-like slot: play renders buffer[playhead:] * volume into the sink."""
+
+    def __init__(self, sink, buffer, volume):
+        self.sink = sink
+        self.buffer = buffer
+        self.volume = volume
+        self.playhead = 0
+
+    def setSound(self, buffer):
+        self.buffer = buffer
+        self.playhead = 0
+
+    def setVolume(self, volume):
+        self.volume = volume
+
+    def seek(self, t):
+        self.playhead = int(round(t * FS))
+
+    def stop(self):
+        pass
+
+    def play(self):
+        self.sink.plays.append(self.buffer[self.playhead :] * self.volume)
+        self.playhead = len(self.buffer)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--repeats", type=int, default=500)
+    parser.add_argument("--output", default=None)
+    parser.add_argument("--tolerance-db", type=float, default=0.01)
+    args = parser.parse_args()
+
+    test_path = os.path.join(TONES_DIR, "tone_5.wav")
+    reference_path = os.path.join(TONES_DIR, "tone_13.wav")
+    n_samples = len(read_wav(test_path)[0])
+    sink = FileSink(n_samples + GAP)
+    pool = SoundPool(
+        {"tone_5": test_path, "reference": reference_path},
+        FS,
+        n_slots=1,
+        sound_factory=sink.factory,
+    )
+    volumes = {"tone_5": 0.5, "reference": 0.1}
+
+    names = ["tone_5" if i % 3 else "reference" for i in range(args.repeats)]
+    start_time = time.perf_counter()
+    for name in names:
+        pool.play(name, volumes[name])
+    pool_us = (time.perf_counter() - start_time) / args.repeats * 1e6
+    pool_constructed = sink.constructed
+
+    start_time = time.perf_counter()
+    for name in names:
+        path = test_path if name == "tone_5" else reference_path
+        sink.factory(read_wav(path)[0], FS, volumes[name]).play()
+    reload_us = (time.perf_counter() - start_time) / args.repeats * 1e6
+    del sink.plays[args.repeats :]
+
+    output = args.output or os.path.join(tempfile.mkdtemp(), "sound_pool_sink.wav")
+    sink.write(output, FS)
+    recorded, _ = read_wav(output)
+    plays = recorded.reshape(args.repeats, sink.period).astype(float)
+    with np.errstate(divide="ignore"):
+        level_db = 10 * np.log10(np.mean(plays[:, :n_samples] ** 2, axis=1))
+
+    failed = False
+    print(f"{args.repeats} plays written to {output}")
+    print(f"slots constructed: {pool_constructed}, per play {pool_us:.1f} us")
+    print(f"decode + new Sound per play: {reload_us:.1f} us")
+    for name in volumes:
+        rows = np.flatnonzero(np.array(names) == name)
+        drift = np.max(np.abs(level_db[rows] - level_db[rows[0]]))
+        print(f"{name}: {len(rows)} plays, max level drift {drift:.4f} dB")
+        failed |= drift > args.tolerance_db
+        # A play that did not start at sample 0 is shorter than the stimulus
+        reference = plays[rows[0], :n_samples]
+        failed |= not np.allclose(plays[rows, :n_samples], reference, atol=1e-4)
+    if failed:
+        print("FAIL: playback changed across repeats")
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,157 @@
+"""
+Headless regression check of VolumeAdjuster's playback logic.
+
+Runs VolumeAdjuster without PsychoPy or an audio device: a simulated clock,
+an idle keyboard and a wait() that advances the clock replace PsychoPy's, and
+a WavSinkBackend on the same clock records what would have been played.
+The script presses "1" (repeat the current sound), then "2" (repeat the
+reference) and steps the adjust_volume timing exactly as its loop does
+(_play_due, then wait(0.01)), and finally calls play_adjusted_sounds.
+
+Checks, from the WAV sink's log and recording:
+  - repeats come every repeat_time seconds (to within one loop step) at the
+    slider volume, and the reference at reference_sound_volume
+  - play_adjusted_sounds plays every sound once, 1 s apart, at its volume
+  - every logged play is in the WAV at its logged frame
+
+Usage:
+    python benchmarks/volume_adjuster_headless.py [--output FILE]
+"""
+
+import argparse
+import csv
+import os
+import sys
+import tempfile
+
+import numpy as np
+
+UTILS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "utils")
+TONES_DIR = os.path.join(UTILS_DIR, "..", "tones")
+sys.path.insert(0, UTILS_DIR)
+
+from audio_backend import WavSinkBackend  # noqa: E402
+from vol_adjustment_slider_object_linux import VolumeAdjuster  # noqa: E402
+from wav_io import read_wav  # noqa: E402
+
+FS = 48000
+STEP = 0.01  # the wait of one adjust_volume loop iteration
+REPEAT_RATE = 1.0
+
+
+class SimulatedClock:
+    """PsychoPy-style clock (getTime) and time source (call) that only wait() advances."""
+
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+    def getTime(self):
+        return self.now
+
+    def wait(self, seconds):
+        self.now += seconds
+
+
+class IdleKeyboard:
+    def getKeys(self, keyList=None):
+        return []
+
+    def getState(self, key):
+        return False
+
+
+def run_session(path):
+    clock = SimulatedClock()
+    backend = WavSinkBackend(path, FS, clock=clock)
+    adjuster = VolumeAdjuster(
+        [f"tone_{i}.wav" for i in range(4)],
+        "tone_13.wav",
+        sound_dir=TONES_DIR,
+        repeat_rate=REPEAT_RATE,
+        reference_sound_volume=0.1,
+        backend=backend,
+        clock=clock,
+        kb=IdleKeyboard(),
+        wait=clock.wait,
+    )
+
+    last_key, last_time = None, None
+    for key, seconds in (("1", 5.0), ("2", 3.0)):
+        last_key, last_time = adjuster._handle_key_press(key, last_key, last_time)
+        for _ in range(int(round(seconds / STEP))):
+            last_time = adjuster._play_due(last_key, last_time, "tone_2", 0.4)
+            adjuster.wait(STEP)
+    last_key, last_time = adjuster._handle_key_press("2", last_key, last_time)
+
+    adjusted = {"tone_0": 0.2, "tone_1": 0.3, "tone_2": 0.4, "tone_3": 0.5}
+    adjustment_start = clock.now
+    adjuster.play_adjusted_sounds(adjusted)
+    backend.close()
+    return backend, adjusted, adjustment_start
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--output", default=None)
+    args = parser.parse_args()
+
+    output = args.output or os.path.join(tempfile.mkdtemp(), "adjuster.wav")
+    backend, adjusted, adjustment_start = run_session(output)
+    with open(backend.log_path, newline="") as log_file:
+        plays = [row for row in csv.DictReader(log_file) if row["Event"] == "play"]
+    times = np.array([float(row["Time"]) for row in plays])
+    names = [row["Name"] for row in plays]
+    volumes = np.array([float(row["Volume"]) for row in plays])
+    reference = os.path.join(TONES_DIR, "tone_13.wav")
+
+    failures = []
+    session = times < adjustment_start
+    repeat_rows = [i for i in np.flatnonzero(session) if names[i] == "tone_2"]
+    reference_rows = [i for i in np.flatnonzero(session) if names[i] == reference]
+    # A play is due one repeat_time after the key press or the previous play;
+    # the loop notices it within one step, so 5 s hold 4 repeats and 3 s hold 2
+    for label, rows, volume, count in (
+        ("repeat", repeat_rows, 0.4, 4),
+        ("reference", reference_rows, 0.1, 2),
+    ):
+        intervals = np.diff(times[rows])
+        print(f"{label}: {len(rows)} plays, intervals {np.round(intervals, 3)}")
+        late = intervals - 1 / REPEAT_RATE
+        if len(rows) != count or np.any((late < -1e-9) | (late > STEP + 1e-6)):
+            failures.append(f"{label} timing")
+        if np.any(volumes[rows] != volume):
+            failures.append(f"{label} volume")
+
+    final = np.flatnonzero(~session)
+    print(f"play_adjusted_sounds: {[names[i] for i in final]}")
+    if [names[i] for i in final] != list(adjusted) or np.any(
+        np.abs(np.diff(times[final]) - 1.0) > 1e-9
+    ):
+        failures.append("play_adjusted_sounds order or spacing")
+    if any(volumes[i] != adjusted[names[i]] for i in final):
+        failures.append("play_adjusted_sounds volume")
+
+    recorded, _ = read_wav(output)
+    worst = 0.0
+    for row in plays:
+        buffer = backend.mixer.voice_output(
+            backend.buffers[row["Name"]], float(row["Volume"])
+        )
+        frame = int(row["Frame"])
+        worst = max(
+            worst, np.max(np.abs(recorded[frame : frame + len(buffer)] - buffer))
+        )
+    print(f"{len(plays)} plays recorded to {output}, largest error {worst:.2e}")
+    if worst > 2 / 32767:
+        failures.append("recording does not match the log")
+
+    for failure in failures:
+        print("FAIL:", failure)
+    sys.exit(1 if failures else 0)
+
+
+if __name__ == "__main__":
+    main()
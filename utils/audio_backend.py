@@ -0,0 +1,308 @@
+"""
+Audio backends behind VolumeAdjuster.
+
+VolumeAdjuster only loads named sounds and plays them at a volume; how that
+reaches a device is up to the backend:
+
+    PTBBackend      PsychoPy / Psychtoolbox. On Linux a new Sound per play
+                    (the ALSA workaround) unless use_pool; preloaded Sounds on
+                    Windows. The PsychoPy audio prefs are set and
+                    psychopy.sound imported only when the backend is created.
+    MixerBackend    one always-open callback stream with a software mixer
+                    (output_mixer). The Linux default (default_backend): the
+                    stream never stops between plays and no Sound object is
+                    reused, so there is no per-play stream or Sound state for
+                    the ALSA volume decay to build up in.
+    NullBackend     accepts everything and plays nothing.
+    WavSinkBackend  records exactly what would have been played: the mixer
+                    output as a WAV file, timed by the real clock, plus a CSV
+                    log of every call with its timestamp and the frame where
+                    it took effect in the WAV.
+
+The null and WAV sink backends need no audio device, so the playback logic
+can be benchmarked and regression-tested headlessly.
+"""
+
+import csv
+import os
+import platform
+import time
+from abc import ABC, abstractmethod
+
+from output_mixer import DeviceOutput, FileSinkOutput, Mixer
+from sound_pool import SoundPool, decode_sound
+
+
+class AudioBackend(ABC):
+    """
+    Interface: sounds are loaded once by name, then played by name.
+
+    load and play are abstract, so a backend missing either fails when it is
+    created rather than at its first play.
+
+    Parameters:
+    sample_rate : int, optional
+        Rate in Hz that sounds are decoded and played at.
+    """
+
+    def __init__(self, sample_rate=48000):
+        self.sample_rate = sample_rate
+
+    @abstractmethod
+    def load(self, sounds):
+        """Load {name: samples array or WAV file path}."""
+
+    @abstractmethod
+    def play(self, name, volume=1.0):
+        """Play a loaded sound from its start."""
+
+    def set_volume(self, name, volume):
+        """Change the volume of a sound that may be playing."""
+
+    def stop(self):
+        """Stop everything that is playing."""
+
+    def close(self):
+        """Release the device (and write any recording)."""
+        self.stop()
+
+
+class PTBBackend(AudioBackend):
+    """
+    PsychoPy sounds with the Psychtoolbox audio library.
+
+    Parameters:
+    sample_rate : int, optional
+        Device sample rate in Hz.
+    device : int, optional
+        PsychoPy audioDevice.
+    latency_mode : int, optional
+        PsychoPy audioLatencyMode.
+    n_slots : int, optional
+        Reusable Sound objects (see SoundPool).
+    preload : bool, optional
+        One slot per sound, created at load time (default on Windows).
+    use_pool : bool, optional
+        Play through reused SoundPool slots (default: only on Windows, where
+        Sounds were always preloaded). Otherwise every play builds a new
+        Sound, the Linux workaround for the ALSA volume decay; reused slots
+        are not yet verified to avoid it.
+    """
+
+    def __init__(
+        self,
+        sample_rate=48000,
+        device=4,
+        latency_mode=4,
+        n_slots=2,
+        preload=None,
+        use_pool=None,
+    ):
+        super().__init__(sample_rate)
+        from psychopy import prefs
+
+        # Must be set before psychopy.sound is first imported
+        prefs.hardware["audioLatencyMode"] = latency_mode
+        prefs.hardware["audioDevice"] = device
+        prefs.general["audioLib"] = ["ptb"]
+        from psychopy import sound
+
+        self._sound = sound
+        is_windows = platform.system() == "Windows"
+        self.n_slots = n_slots
+        self.use_pool = is_windows if use_pool is None else use_pool
+        self.preload = is_windows if preload is None else preload
+        self.pool = None
+        self.sounds = {}
+        self._playing = {}
+
+    def load(self, sounds):
+        if not self.use_pool:
+            # Paths or buffers, handed to a new Sound on every play
+            self.sounds = dict(sounds)
+            return
+        n_slots = max(len(sounds), 1) if self.preload else self.n_slots
+        self.pool = SoundPool(sounds, self.sample_rate, n_slots=n_slots)
+        if self.preload:
+            self.pool.preload()
+
+    def play(self, name, volume=1.0):
+        if self.use_pool:
+            self.pool.play(name, volume)
+            return
+        value = self.sounds[name]
+        if isinstance(value, (str, os.PathLike)):
+            new_sound = self._sound.Sound(value, volume=volume)
+        else:
+            new_sound = self._sound.Sound(
+                value, sampleRate=self.sample_rate, volume=volume
+            )
+        new_sound.play()
+        self._playing[name] = new_sound
+
+    def set_volume(self, name, volume):
+        if self.use_pool:
+            self.pool.set_volume(name, volume)
+        elif name in self._playing:
+            self._playing[name].setVolume(volume)
+
+    def stop(self):
+        if self.pool is not None:
+            self.pool.stop()
+        for playing in self._playing.values():
+            playing.stop()
+        self._playing.clear()
+
+
+class MixerBackend(AudioBackend):
+    """
+    Software mixer on one always-open output stream.
+
+    Parameters:
+    mixer : Mixer, optional
+        Mixer to submit to (default: a mono Mixer at sample_rate).
+    output : optional
+        Stream rendering the mixer (default: a DeviceOutput).
+    device : int or str, optional
+        sounddevice device of the default output.
+    block_size : int, optional
+        Frames per callback of the default output.
+    """
+
+    def __init__(
+        self, sample_rate=48000, mixer=None, output=None, device=None, block_size=256
+    ):
+        super().__init__(sample_rate if mixer is None else mixer.fs)
+        self.mixer = Mixer(sample_rate) if mixer is None else mixer
+        self.output = (
+            DeviceOutput(self.mixer, device, block_size) if output is None else output
+        )
+        self.buffers = {}
+        self._voices = {}
+
+    def load(self, sounds):
+        self.buffers = {
+            name: decode_sound(value, self.sample_rate)
+            for name, value in sounds.items()
+        }
+
+    def play(self, name, volume=1.0):
+        self._voices[name] = self.mixer.play(self.buffers[name], volume)
+
+    def set_volume(self, name, volume):
+        if name in self._voices:
+            self.mixer.set_gain(self._voices[name], volume)
+
+    def stop(self):
+        self.mixer.stop()
+
+    def close(self):
+        self.stop()
+        self.output.close()
+
+
+def default_backend(sample_rate=48000):
+    """
+    Backend VolumeAdjuster uses when none is given.
+
+    MixerBackend on Linux, falling back to PTBBackend (a new Sound per play)
+    when sounddevice is not installed; PTBBackend elsewhere.
+    """
+    if platform.system() == "Linux":
+        try:
+            return MixerBackend(sample_rate)
+        except ImportError:
+            print(
+                "Warning: sounddevice is not installed; falling back to "
+                "PTBBackend, which reloads every sound on Linux."
+            )
+    return PTBBackend(sample_rate)
+
+
+class NullBackend(AudioBackend):
+    """Checks names and counts plays; no decoding and no output."""
+
+    def __init__(self, sample_rate=48000):
+        super().__init__(sample_rate)
+        self.names = set()
+        self.plays = 0
+
+    def load(self, sounds):
+        self.names = set(sounds)
+
+    def play(self, name, volume=1.0):
+        assert name in self.names, f"Sound not loaded: {name}"
+        self.plays += 1
+
+
+class WavSinkBackend(MixerBackend):
+    """
+    Records what a MixerBackend would have played, in real time, to a WAV file.
+
+    Calls are timestamped with clock() (seconds since the backend was
+    created). The recording is rendered up to each call's timestamp before
+    the call is applied, so a sound starts in the WAV at the frame logged
+    for it, to within one block.
+
+    Parameters:
+    path : str
+        WAV file; the log is written next to it with a .csv extension.
+    block_size : int, optional
+        Frames per rendered block (the timing resolution).
+    clock : callable, optional
+        Time source in seconds (default time.perf_counter).
+    max_voices, ramp_ms : optional
+        Passed to the Mixer.
+    """
+
+    def __init__(
+        self,
+        path,
+        sample_rate=48000,
+        block_size=64,
+        clock=None,
+        max_voices=8,
+        ramp_ms=5.0,
+    ):
+        mixer = Mixer(sample_rate, max_voices=max_voices, ramp_ms=ramp_ms)
+        super().__init__(
+            mixer=mixer, output=FileSinkOutput(mixer, path, block_size=block_size)
+        )
+        self.path = path
+        self.log_path = os.path.splitext(path)[0] + ".csv"
+        self.clock = clock or time.perf_counter
+        self._start_time = self.clock()
+        self.events = []
+
+    def _log(self, event, name="", volume=""):
+        # Render up to now, so the call takes effect at the current frame
+        timestamp = self.clock() - self._start_time
+        self.output.advance(
+            int(round(timestamp * self.sample_rate)) - self.output.frames
+        )
+        self.events.append((timestamp, self.output.frames, event, name, volume))
+
+    def play(self, name, volume=1.0):
+        assert name in self.buffers, f"Sound not loaded: {name}"
+        self._log("play", name, volume)
+        super().play(name, volume)
+
+    def set_volume(self, name, volume):
+        if name in self._voices:
+            self._log("volume", name, volume)
+            super().set_volume(name, volume)
+
+    def stop(self):
+        self._log("stop")
+        super().stop()
+
+    def close(self):
+        """Render until every voice has finished, then write the WAV and the log."""
+        self.output.advance(self.output.block_size)
+        while self.mixer.active:
+            self.output.advance(self.output.block_size)
+        self.output.close()
+        with open(self.log_path, "w", newline="") as log_file:
+            writer = csv.writer(log_file)
+            writer.writerow(["Time", "Frame", "Event", "Name", "Volume"])
+            writer.writerows(self.events)
@@ -0,0 +1,116 @@
+"""
+Memoizing front end for iso226 and normalize_loudness_direct.
+
+Trial code asks for the same few (phon, frequency set) combinations over and
+over; ContourCache keeps the results in a bounded LRU so repeated requests are
+dictionary hits. Returned arrays are read-only because they are shared between
+callers.
+"""
+
+import hashlib
+from collections import OrderedDict, namedtuple
+
+import numpy as np
+
+from equal_loudness_contor_2023ISO_params import iso226, normalize_loudness_direct
+
+CacheInfo = namedtuple("CacheInfo", ["hits", "misses", "maxsize", "currsize"])
+
+
+def _array_key(values):
+    # Shape plus digest of the float64 bytes, so equal arrays share a key
+    if values is None:
+        return None
+    values = np.asarray(values, dtype=float)
+    return values.shape, hashlib.blake2b(values.tobytes(), digest_size=16).digest()
+
+
+def _read_only(array):
+    array = np.asarray(array)
+    array.setflags(write=False)
+    return array
+
+
+class ContourCache:
+    """
+    LRU cache of contour evaluations.
+
+    Parameters:
+    maxsize : int, optional
+        Number of results kept; the least recently used entry is evicted first.
+    """
+
+    def __init__(self, maxsize=128):
+        assert maxsize > 0, "maxsize must be positive."
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()
+
+    def _lookup(self, key, compute):
+        if key in self._entries:
+            self.hits += 1
+            self._entries.move_to_end(key)
+            return self._entries[key]
+
+        self.misses += 1
+        result = compute()
+        self._entries[key] = result
+        if len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
+        return result
+
+    def iso226(self, phon, fq=None, mirror=0, standard="2023"):
+        """Cached iso226(phon, fq, mirror=mirror, standard=standard); returns (spl, f, params)."""
+
+        def compute():
+            spl, f, params = iso226(phon, fq, mirror=mirror, standard=standard)
+            return _read_only(spl), f, params
+
+        key = ("iso226", _array_key(phon), _array_key(fq), standard, mirror)
+        return self._lookup(key, compute)
+
+    def normalize_loudness_direct(
+        self,
+        phon,
+        fq=None,
+        a=0.34,
+        b=111.8,
+        standard="2023",
+        mirror=0,
+        calibration=None,
+    ):
+        """Cached normalize_loudness_direct; returns (volumes, frequencies)."""
+
+        def compute():
+            volumes, frequencies = normalize_loudness_direct(
+                phon,
+                fq,
+                a=a,
+                b=b,
+                standard=standard,
+                mirror=mirror,
+                calibration=calibration,
+            )
+            return _read_only(volumes), frequencies
+
+        # The calibration object itself is part of the key (hashed by identity)
+        key = (
+            "volumes",
+            _array_key(phon),
+            _array_key(fq),
+            standard,
+            mirror,
+            a,
+            b,
+            calibration,
+        )
+        return self._lookup(key, compute)
+
+    def cache_info(self):
+        return CacheInfo(self.hits, self.misses, self.maxsize, len(self._entries))
+
+    def cache_clear(self):
+        self._entries.clear()
+        self.hits = 0
+        self.misses = 0
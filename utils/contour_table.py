@@ -0,0 +1,138 @@
+"""
+Dense, memory-mapped equal-loudness lookup table.
+
+build_contour_table precomputes SPL and normalize_loudness_direct volumes on a
+uniform phon x log-frequency grid and saves them as a single .npy file.
+ContourTable maps that file read-only and answers queries by bilinear
+interpolation; it only needs NumPy, so experiment processes start fast and
+share the table through the page cache.
+
+File layout: an array of shape (2, n_phon + 1, n_freq + 1). Plane 0 holds SPL
+and plane 1 holds volumes. In both planes row 0 holds the frequency axis, column 0
+holds the phon axis, and [1:, 1:] holds the values.
+"""
+
+import sys
+
+import numpy as np
+
+from equal_loudness_contor_2023ISO_params import iso226
+
+SPL, VOLUME = 0, 1
+
+
+def build_contour_table(
+    path,
+    phon_min=0.0,
+    phon_max=100.0,
+    phon_step=0.1,
+    f_min=20.0,
+    f_max=20000.0,
+    bands_per_octave=48,
+    a=0.34,
+    b=111.8,
+    standard="2023",
+):
+    """
+    Precompute SPL and volume on a phon x frequency grid and save it for ContourTable.
+
+    Parameters:
+    path : str
+        Output .npy file.
+    phon_min, phon_max, phon_step : float, optional
+        Uniform phon axis (default 0-100 phon in 0.1 steps).
+    f_min, f_max : float, optional
+        Frequency range in Hz; the last grid point is the first one >= f_max.
+    bands_per_octave : int, optional
+        Frequency resolution of the log-spaced axis (default 1/48 octave).
+    a, b : float, optional
+        Calibration pair passed to normalize_loudness_direct.
+    standard : str, optional
+        Edition of ISO 226 (parameter table and formula), "2023" (default) or "2003".
+
+    Returns:
+    path : str
+        The path that was written.
+    """
+
+    n_phon = int(round((phon_max - phon_min) / phon_step)) + 1
+    n_freq = int(np.ceil(np.log2(f_max / f_min) * bands_per_octave)) + 1
+    phon = np.linspace(phon_min, phon_max, n_phon)
+    freq = f_min * 2 ** (np.arange(n_freq) / bands_per_octave)
+
+    spl, _, _ = iso226(phon, fq=freq, standard=standard)
+
+    table = np.zeros((2, n_phon + 1, n_freq + 1))
+    table[:, 0, 1:] = freq
+    table[:, 1:, 0] = phon
+    table[SPL, 1:, 1:] = spl.T
+    # Same calibration formula as normalize_loudness_direct, without a second iso226 pass
+    table[VOLUME, 1:, 1:] = ((a / 0.1) / (10 ** (b / 20))) * (10 ** (spl.T / 20))
+
+    np.save(path, table)
+    return path
+
+
+class ContourTable:
+    """
+    Read-only view of a table written by build_contour_table.
+
+    Queries outside the grid are clamped to its edges; non-finite phon levels
+    and frequencies that are not finite and positive raise ValueError.
+    """
+
+    def __init__(self, path):
+        self._table = np.load(path, mmap_mode="r")
+        self._values = self._table[:, 1:, 1:]
+        self.phon = np.array(self._table[SPL, 1:, 0])
+        self.frequencies = np.array(self._table[SPL, 0, 1:])
+
+        # Both axes are uniform (phon linear, frequency in log2), so grid
+        # coordinates are computed directly instead of searched
+        self._phon_min = self.phon[0]
+        self._phon_step = (self.phon[-1] - self.phon[0]) / (len(self.phon) - 1)
+        self._log2_f_min = np.log2(self.frequencies[0])
+        self._log2_f_step = (np.log2(self.frequencies[-1]) - self._log2_f_min) / (
+            len(self.frequencies) - 1
+        )
+
+    def spl(self, phon, fq):
+        """SPL (dB) for the given phon levels and frequencies, broadcast together."""
+        return self._lookup(SPL, phon, fq)
+
+    def volume(self, phon, fq):
+        """normalize_loudness_direct volume for the given phon levels and frequencies."""
+        return self._lookup(VOLUME, phon, fq)
+
+    def _lookup(self, plane, phon, fq):
+        phon = np.asarray(phon, dtype=float)
+        fq = np.asarray(fq, dtype=float)
+        # NaN survives np.clip and becomes a garbage index in astype(np.intp)
+        if not np.all(np.isfinite(phon)):
+            raise ValueError("phon must be finite.")
+        if not np.all(np.isfinite(fq) & (fq > 0)):
+            raise ValueError("Frequencies must be finite and greater than 0 Hz.")
+        x = (phon - self._phon_min) / self._phon_step
+        y = (np.log2(fq) - self._log2_f_min) / self._log2_f_step
+        n_x, n_y = self._values.shape[1:]
+        x = np.clip(x, 0, n_x - 1)
+        y = np.clip(y, 0, n_y - 1)
+        i = np.minimum(x.astype(np.intp), n_x - 2)
+        j = np.minimum(y.astype(np.intp), n_y - 2)
+        tx = x - i
+        ty = y - j
+
+        grid = self._values[plane]
+        low = grid[i, j] * (1 - ty) + grid[i, j + 1] * ty
+        high = grid[i + 1, j] * (1 - ty) + grid[i + 1, j + 1] * ty
+        return (low * (1 - tx) + high * tx)[()]
+
+
+if __name__ == "__main__":
+    table_path = sys.argv[1] if len(sys.argv) > 1 else "contour_table.npy"
+    build_contour_table(table_path)
+
+    table = ContourTable(table_path)
+    print("Grid:", len(table.phon), "phon x", len(table.frequencies), "frequencies")
+    print("SPL at 60 phon, 1 kHz:", table.spl(60, 1000))
+    print("Volume at 60 phon, 1 kHz:", table.volume(60, 1000))
@@ -0,0 +1,139 @@
+"""
+Per-frequency device calibration for normalize_loudness_direct.
+
+normalize_loudness_direct assumes a flat device that plays a full-scale tone
+at volume v at volume_to_spl(v, a, b) = b + 20 lg(v * 0.1 / a) dB SPL at every
+frequency. DeviceCalibration replaces that with a measured response: the dB SPL
+per frequency of a full-scale tone played at reference_volume. The response is interpolated in log-frequency onto the
+stimulus frequencies once, and the resulting gains are cached per frequency
+set, so volumes for a whole stimulus bank are one array multiply.
+
+Measurement files:
+    CSV with a header row and columns Frequency,SPL
+    NPZ with arrays "frequency" and "spl" (and optionally "reference_volume")
+"""
+
+import csv
+import hashlib
+import os
+import sys
+
+import numpy as np
+
+
+class DeviceCalibration:
+    """
+    Measured dB SPL per frequency of one output device at a reference volume.
+
+    Parameters:
+    frequencies : array-like
+        Measurement frequencies in Hz.
+    spl : array-like
+        dB SPL measured at each frequency with the device at reference_volume.
+    reference_volume : float, optional
+        Volume setting the measurement was made at (default 0.34). A flat
+        device equivalent to the (a, b) pair measures volume_to_spl(0.34, a, b)
+        = b - 20 dB SPL at this setting.
+    name : str, optional
+        Device label, e.g. the headphone model.
+    """
+
+    def __init__(self, frequencies, spl, reference_volume=0.34, name=None):
+        frequencies = np.asarray(frequencies, dtype=float)
+        spl = np.asarray(spl, dtype=float)
+        assert frequencies.shape == spl.shape, "One SPL value per frequency needed."
+        assert np.all(frequencies > 0), "Frequencies must be greater than 0 Hz."
+
+        order = np.argsort(frequencies)
+        self.frequencies = frequencies[order]
+        self.spl = spl[order]
+        self.frequencies.setflags(write=False)
+        self.spl.setflags(write=False)
+        self.reference_volume = float(reference_volume)
+        self.name = name
+        self._gains = {}
+
+    @classmethod
+    def from_csv(cls, path, reference_volume=0.34, name=None):
+        with open(path, newline="") as csv_file:
+            rows = list(csv.DictReader(csv_file))
+        return cls(
+            [float(row["Frequency"]) for row in rows],
+            [float(row["SPL"]) for row in rows],
+            reference_volume=reference_volume,
+            name=name or os.path.splitext(os.path.basename(path))[0],
+        )
+
+    @classmethod
+    def from_npz(cls, path, reference_volume=None, name=None):
+        with np.load(path) as data:
+            if reference_volume is None:
+                reference_volume = float(data.get("reference_volume", 0.34))
+            return cls(
+                data["frequency"],
+                data["spl"],
+                reference_volume=reference_volume,
+                name=name or os.path.splitext(os.path.basename(path))[0],
+            )
+
+    @classmethod
+    def load(cls, path, **kwargs):
+        """Load a CSV or NPZ measurement file, chosen by extension."""
+        if path.lower().endswith(".npz"):
+            return cls.from_npz(path, **kwargs)
+        return cls.from_csv(path, **kwargs)
+
+    def save_npz(self, path):
+        np.savez(
+            path,
+            frequency=self.frequencies,
+            spl=self.spl,
+            reference_volume=self.reference_volume,
+        )
+
+    def cache_key(self):
+        """Hex digest of the measurement, for invalidating tables computed with it."""
+        digest = hashlib.blake2b(digest_size=16)
+        digest.update(self.frequencies.tobytes())
+        digest.update(self.spl.tobytes())
+        digest.update(np.float64(self.reference_volume).tobytes())
+        return digest.hexdigest()
+
+    def spl_at(self, fq):
+        """Device output (dB SPL at the reference volume) interpolated in log-frequency; edges are held."""
+        fq = np.asarray(fq, dtype=float)
+        return np.interp(np.log2(fq), np.log2(self.frequencies), self.spl)
+
+    def gain(self, fq):
+        """
+        Volume per unit sound pressure at fq, so that volumes = gain * 10 ** (spl / 20).
+
+        The volume for the measured level is reference_volume itself. This is
+        the ((a / 0.1) / 10 ** (b / 20)) of normalize_loudness_direct with
+        a = reference_volume and b = measured SPL + 20. Results are cached per
+        frequency set and returned read-only.
+        """
+        fq = np.asarray(fq, dtype=float)
+        key = (fq.shape, hashlib.blake2b(fq.tobytes(), digest_size=16).digest())
+        if key not in self._gains:
+            gain = self.reference_volume / (10 ** (self.spl_at(fq) / 20))
+            gain.setflags(write=False)
+            self._gains[key] = gain
+        return self._gains[key]
+
+
+if __name__ == "__main__":
+    from equal_loudness_contor_2023ISO_params import normalize_loudness_direct
+
+    calibration = DeviceCalibration.load(sys.argv[1])
+    metadata_path = sys.argv[2] if len(sys.argv) > 2 else "tones/tones_metadata.csv"
+    with open(metadata_path, newline="") as csv_file:
+        tone_frequencies = np.array(
+            [float(row["Frequency"]) for row in csv.DictReader(csv_file)]
+        )
+
+    volumes, _ = normalize_loudness_direct(
+        60, fq=tone_frequencies, calibration=calibration
+    )
+    print("Device:", calibration.name)
+    print("Volumes at 60 phon:", volumes.flatten())
@@ -1,167 +1,148 @@
 import numpy as np
-from scipy import interpolate
-import matplotlib.pyplot as plt
+from types import MappingProxyType
 
 
-def iso226(phon, fq=None, sq=False, mirror=0):
-    # Ensure phon is treated as an array
-    phon = np.atleast_1d(phon)
+def _freeze(table):
+    # Convert a parameter table to read-only float arrays behind a read-only mapping
+    frozen = {}
+    for key, values in table.items():
+        frozen[key] = np.array(values, dtype=float)
+        frozen[key].setflags(write=False)
+    return MappingProxyType(frozen)
 
-    # Check input
-    if np.any(phon > 80):
-        print(
-            "Warning: SPL values may not be accurate for loudness levels above 80 phon."
-        )
-    elif np.any((phon != 0) & (phon < 20)):
-        print(
-            "Warning: SPL values may not be accurate for loudness levels below 20 phon."
-        )
-
-    if fq is not None:
-        if np.any((fq < 20) | (fq > 4000)) and np.any(phon > 90):
-            print(
-                "Warning: ISO 226:2003 is valid for 20-4000 Hz only up to 90 phon. SPL values may be inaccurate."
-            )
-        elif np.any((fq < 5000) | (fq > 12500)) and np.any(phon > 80):
-            print(
-                "Warning: ISO 226:2003 is valid for 5000-12500 Hz only up to 80 phon. SPL values may be inaccurate."
-            )
-        elif np.any(fq > 12500):
-            print(
-                "Warning: ISO 226:2003 defines loudness levels up to 12.5 kHz. SPL values for frequencies above 12.5 kHz may be inaccurate."
-            )
-        assert np.all(fq >= 0), "Frequencies must be greater than or equal to 0 Hz."
 
-    # References iso2003
-    # params = {
-    #     "f": [
-    #         20,
-    #         25,
-    #         31.5,
-    #         40,
-    #         50,
-    #         63,
-    #         80,
-    #         100,
-    #         125,
-    #         160,
-    #         200,
-    #         250,
-    #         315,
-    #         400,
-    #         500,
-    #         630,
-    #         800,
-    #         1000,
-    #         1250,
-    #         1600,
-    #         2000,
-    #         2500,
-    #         3150,
-    #         4000,
-    #         5000,
-    #         6300,
-    #         8000,
-    #         10000,
-    #         12500,
-    #     ],
-    #     "alpha_f": [
-    #         0.532,
-    #         0.506,
-    #         0.480,
-    #         0.455,
-    #         0.432,
-    #         0.409,
-    #         0.387,
-    #         0.367,
-    #         0.349,
-    #         0.330,
-    #         0.315,
-    #         0.301,
-    #         0.288,
-    #         0.276,
-    #         0.267,
-    #         0.259,
-    #         0.253,
-    #         0.250,
-    #         0.246,
-    #         0.244,
-    #         0.243,
-    #         0.243,
-    #         0.243,
-    #         0.242,
-    #         0.242,
-    #         0.245,
-    #         0.254,
-    #         0.271,
-    #         0.301,
-    #     ],
-    #     "L_U": [
-    #         -31.6,
-    #         -27.2,
-    #         -23.0,
-    #         -19.1,
-    #         -15.9,
-    #         -13.0,
-    #         -10.3,
-    #         -8.1,
-    #         -6.2,
-    #         -4.5,
-    #         -3.1,
-    #         -2.0,
-    #         -1.1,
-    #         -0.4,
-    #         0.0,
-    #         0.3,
-    #         0.5,
-    #         0.0,
-    #         -2.7,
-    #         -4.1,
-    #         -1.0,
-    #         1.7,
-    #         2.5,
-    #         1.2,
-    #         -2.1,
-    #         -7.1,
-    #         -11.2,
-    #         -10.7,
-    #         -3.1,
-    #     ],
-    #     "T_f": [
-    #         78.5,
-    #         68.7,
-    #         59.5,
-    #         51.1,
-    #         44.0,
-    #         37.5,
-    #         31.5,
-    #         26.5,
-    #         22.1,
-    #         17.9,
-    #         14.4,
-    #         11.4,
-    #         8.6,
-    #         6.2,
-    #         4.4,
-    #         3.0,
-    #         2.2,
-    #         2.4,
-    #         3.5,
-    #         1.7,
-    #         -1.3,
-    #         -4.2,
-    #         -6.0,
-    #         -5.4,
-    #         -1.5,
-    #         6.0,
-    #         12.6,
-    #         13.9,
-    #         12.3,
-    #     ],
-    # }
-    # References iso2023
-
-    params = {
+# References iso2003
+ISO226_2003_PARAMS = _freeze(
+    {
+        "f": [
+            20,
+            25,
+            31.5,
+            40,
+            50,
+            63,
+            80,
+            100,
+            125,
+            160,
+            200,
+            250,
+            315,
+            400,
+            500,
+            630,
+            800,
+            1000,
+            1250,
+            1600,
+            2000,
+            2500,
+            3150,
+            4000,
+            5000,
+            6300,
+            8000,
+            10000,
+            12500,
+        ],
+        "alpha_f": [
+            0.532,
+            0.506,
+            0.480,
+            0.455,
+            0.432,
+            0.409,
+            0.387,
+            0.367,
+            0.349,
+            0.330,
+            0.315,
+            0.301,
+            0.288,
+            0.276,
+            0.267,
+            0.259,
+            0.253,
+            0.250,
+            0.246,
+            0.244,
+            0.243,
+            0.243,
+            0.243,
+            0.242,
+            0.242,
+            0.245,
+            0.254,
+            0.271,
+            0.301,
+        ],
+        "L_U": [
+            -31.6,
+            -27.2,
+            -23.0,
+            -19.1,
+            -15.9,
+            -13.0,
+            -10.3,
+            -8.1,
+            -6.2,
+            -4.5,
+            -3.1,
+            -2.0,
+            -1.1,
+            -0.4,
+            0.0,
+            0.3,
+            0.5,
+            0.0,
+            -2.7,
+            -4.1,
+            -1.0,
+            1.7,
+            2.5,
+            1.2,
+            -2.1,
+            -7.1,
+            -11.2,
+            -10.7,
+            -3.1,
+        ],
+        "T_f": [
+            78.5,
+            68.7,
+            59.5,
+            51.1,
+            44.0,
+            37.5,
+            31.5,
+            26.5,
+            22.1,
+            17.9,
+            14.4,
+            11.4,
+            8.6,
+            6.2,
+            4.4,
+            3.0,
+            2.2,
+            2.4,
+            3.5,
+            1.7,
+            -1.3,
+            -4.2,
+            -6.0,
+            -5.4,
+            -1.5,
+            6.0,
+            12.6,
+            13.9,
+            12.3,
+        ],
+    }
+)
+# References iso2023
+ISO226_2023_PARAMS = _freeze(
+    {
         "f": [
             20,
             25,
@@ -287,55 +268,205 @@ def iso226(phon, fq=None, sq=False, mirror=0):
             12.3,
         ],
     }
+)
+
+ISO226_PARAMS = {"2003": ISO226_2003_PARAMS, "2023": ISO226_2023_PARAMS}
+
+# Fitted spline coefficients, keyed by (standard, mirror); mirror is None when
+# the table is used as-is and an index into the table when a 20 kHz anchor is
+# added for extrapolation. Filled lazily by _spline_coefficients.
+_SPLINE_CACHE = {}
+
+
+def _not_a_knot_spline(x, y):
+    """
+    Piecewise-cubic coefficients of the not-a-knot cubic spline through (x, y).
+
+    Same coefficients as scipy.interpolate.CubicSpline(x, y, bc_type="not-a-knot")
+    (shape (4, len(x) - 1) + y.shape[1:], highest power first), solved with
+    NumPy for the second derivatives M at the breakpoints.
+    """
+    n = len(x)
+    assert n >= 4, "A not-a-knot spline needs at least 4 points."
+    h = np.diff(x)
+    slopes = np.diff(y, axis=0) / h[:, np.newaxis]
+
+    system = np.zeros((n, n))
+    rhs = np.zeros((n,) + y.shape[1:])
+    for i in range(1, n - 1):
+        system[i, i - 1 : i + 2] = h[i - 1], 2 * (h[i - 1] + h[i]), h[i]
+        rhs[i] = 6 * (slopes[i] - slopes[i - 1])
+    # Not-a-knot: the third derivative is continuous at the second and the
+    # second-to-last breakpoint
+    system[0, :3] = h[1], -(h[0] + h[1]), h[0]
+    system[-1, -3:] = h[-1], -(h[-2] + h[-1]), h[-2]
+    M = np.linalg.solve(system, rhs)
+
+    h = h[:, np.newaxis]
+    return np.stack(
+        [
+            (M[1:] - M[:-1]) / (6 * h),
+            M[:-1] / 2,
+            slopes - h * (2 * M[:-1] + M[1:]) / 6,
+            y[:-1],
+        ]
+    )
+
+
+def _spline_coefficients(standard="2023", mirror=None):
+    """
+    Return the cached breakpoints and piecewise-cubic coefficients for alpha_f, L_U and T_f.
+
+    The three curves are fitted together as one not-a-knot cubic spline (the same
+    interpolant as interp1d(kind="cubic")), so coeffs has shape (4, n_breaks - 1, 3).
+    """
+    key = (standard, mirror)
+    if key not in _SPLINE_CACHE:
+        params = ISO226_PARAMS[standard]
+        table = np.column_stack(
+            [params["f"], params["alpha_f"], params["L_U"], params["T_f"]]
+        )
+        if mirror is not None:
+            table = np.vstack([table, [20000, *table[mirror, 1:]]])
+        breaks = table[:, 0].copy()
+        coeffs = _not_a_knot_spline(breaks, table[:, 1:])
+        breaks.setflags(write=False)
+        coeffs.setflags(write=False)
+        _SPLINE_CACHE[key] = (breaks, coeffs)
+    return _SPLINE_CACHE[key]
+
+
+# Reference exponent and 1 kHz hearing threshold of the ISO 226:2023 formula
+ALPHA_R = 0.300
+T_R = 2.4
+
+
+def _equation_terms(standard, alpha_f, L_U, T_f):
+    """
+    Terms of the edition's equal-loudness formula, written for both editions as
+
+        L_p = (10 / alpha_f) * lg(K * (10 ** (c * L_N) - D) + B) - L_U + offset
+
+    ISO 226:2003: K = 4.47e-3, c = 0.025, D = 1.15,
+    B = (0.4 * 10 ** ((T_f + L_U) / 10 - 9)) ** alpha_f, offset = 94.
+    ISO 226:2023: K = (4e-10) ** (alpha_r - alpha_f), c = alpha_r / 10,
+    D = 10 ** (alpha_r * T_r / 10), B = 10 ** (alpha_f * (T_f + L_U) / 10),
+    offset = 0, with alpha_r = 0.300 and T_r = 2.4 dB.
+
+    Returns:
+    K, c, D, B, offset
+        K and B have the shape of alpha_f; c, D and offset are floats.
+    """
+    if standard == "2003":
+        K = np.full(np.shape(alpha_f), 0.00447)
+        B = (0.4 * (10 ** ((T_f + L_U) / 10 - 9))) ** alpha_f
+        return K, 0.025, 1.15, B, 94.0
+    K = (4e-10) ** (ALPHA_R - alpha_f)
+    B = 10 ** (alpha_f * (T_f + L_U) / 10)
+    return K, ALPHA_R / 10, 10 ** (ALPHA_R * T_R / 10), B, 0.0
+
+
+def _evaluate_spline(breaks, coeffs, x):
+    # Piecewise Horner evaluation; the end pieces extrapolate beyond the table
+    idx = np.clip(np.searchsorted(breaks, x, side="right") - 1, 0, len(breaks) - 2)
+    dx = (x - breaks[idx])[:, np.newaxis]
+    c = coeffs[:, idx]
+    y = c[0]
+    for k in range(1, c.shape[0]):
+        y = y * dx + c[k]
+    return y
+
+
+def _contour_parameters(standard, mirror, f):
+    """
+    alpha_f, L_U and T_f at the 1-D frequencies f.
+
+    Frequencies up to 12.5 kHz use the spline of the table alone. Only those
+    above use the spline refitted with the 20 kHz anchor (table row mirror),
+    so the values at a frequency do not depend on what else is in f.
+    """
+    breaks, coeffs = _spline_coefficients(standard)
+    values = _evaluate_spline(breaks, coeffs, f)
+    above = f > 12500
+    if np.any(above):
+        breaks, coeffs = _spline_coefficients(standard, mirror)
+        values[above] = _evaluate_spline(breaks, coeffs, f[above])
+    return values.T
+
+
+def iso226(phon, fq=None, sq=False, mirror=0, standard="2023"):
+    # Ensure phon is treated as an array
+    phon = np.atleast_1d(phon)
+    assert standard in ISO226_PARAMS, f"Unknown ISO 226 standard: {standard}"
+
+    # Check input
+    if np.any(phon > 80):
+        print(
+            "Warning: SPL values may not be accurate for loudness levels above 80 phon."
+        )
+    elif np.any((phon != 0) & (phon < 20)):
+        print(
+            "Warning: SPL values may not be accurate for loudness levels below 20 phon."
+        )
+
+    if fq is not None:
+        fq = np.asarray(fq)
+        if np.any((fq < 20) | (fq > 4000)) and np.any(phon > 90):
+            print(
+                f"Warning: ISO 226:{standard} is valid for 20-4000 Hz only up to 90 phon. SPL values may be inaccurate."
+            )
+        elif np.any((fq < 5000) | (fq > 12500)) and np.any(phon > 80):
+            print(
+                f"Warning: ISO 226:{standard} is valid for 5000-12500 Hz only up to 80 phon. SPL values may be inaccurate."
+            )
+        elif np.any(fq > 12500):
+            print(
+                f"Warning: ISO 226:{standard} defines loudness levels up to 12.5 kHz. SPL values for frequencies above 12.5 kHz may be inaccurate."
+            )
+        assert np.all(fq >= 0), "Frequencies must be greater than or equal to 0 Hz."
+
+    # Read-only view of the module-level table; nothing is copied per call
+    params = ISO226_PARAMS[standard]
 
     # Calculate
     if fq is None:
-        f = np.array(params["f"])
+        f = params["f"]
     else:
         f = np.array(fq)
 
     phon = np.array(phon)
     out_dims = f.shape + phon.shape
-    f_squeeze = np.tile(f.flatten(), (len(phon), 1)).T
-    spl_squeeze = np.zeros_like(f_squeeze)
-
-    for p in range(len(phon)):
-        if fq is not None:
-            if np.any(f_squeeze[:, p] > 12500):
-                f_r_extrap = params["f"] + [20000]
-                alpha_f_r_extrap = params["alpha_f"] + [params["alpha_f"][mirror]]
-                L_U_r_extrap = params["L_U"] + [params["L_U"][mirror]]
-                T_f_r_extrap = params["T_f"] + [params["T_f"][mirror]]
-            else:
-                f_r_extrap = params["f"]
-                alpha_f_r_extrap = params["alpha_f"]
-                L_U_r_extrap = params["L_U"]
-                T_f_r_extrap = params["T_f"]
-
-            alpha_f = interpolate.interp1d(
-                f_r_extrap, alpha_f_r_extrap, kind="cubic", fill_value="extrapolate"
-            )(f_squeeze[:, p])
-            L_U = interpolate.interp1d(
-                f_r_extrap, L_U_r_extrap, kind="cubic", fill_value="extrapolate"
-            )(f_squeeze[:, p])
-            T_f = interpolate.interp1d(
-                f_r_extrap, T_f_r_extrap, kind="cubic", fill_value="extrapolate"
-            )(f_squeeze[:, p])
-        else:
-            alpha_f = np.array(params["alpha_f"])
-            L_U = np.array(params["L_U"])
-            T_f = np.array(params["T_f"])
 
-        A_f = 0.00447 * ((10 ** (0.025 * phon[p])) - 1.15) + (
-            (0.4 * (10 ** ((T_f + L_U) / 10 - 9))) ** alpha_f
+    if fq is not None:
+        # Evaluate the cached splines once per unique frequency; duplicates are expanded at the end
+        f_unique, f_inverse = np.unique(f.ravel(), return_inverse=True)
+        alpha_f, L_U, T_f = _contour_parameters(standard, mirror, f_unique)
+    else:
+        f_inverse = None
+        alpha_f = params["alpha_f"]
+        L_U = params["L_U"]
+        T_f = params["T_f"]
+
+    # Frequencies along rows, phon levels along columns: one pass for the whole grid
+    alpha_f = alpha_f[:, np.newaxis]
+    L_U = L_U[:, np.newaxis]
+    T_f = T_f[:, np.newaxis]
+    phon_row = phon.reshape(1, -1)
+
+    K, c, D, B_f, offset = _equation_terms(standard, alpha_f, L_U, T_f)
+    A_f = K * ((10 ** (c * phon_row)) - D) + B_f
+
+    # A_f can be non-positive for phon <= 0; those cells take the threshold branch
+    with np.errstate(divide="ignore", invalid="ignore"):
+        spl_squeeze = np.where(
+            phon_row > 0, ((10 / alpha_f) * np.log10(A_f)) - L_U + offset, T_f
         )
 
-        if phon[p] > 0:
-            spl_squeeze[:, p] = ((10 / alpha_f) * np.log10(A_f)) - L_U + 94
-        else:
-            spl_squeeze[:, p] = T_f
+    if f_inverse is not None:
+        spl_squeeze = spl_squeeze[f_inverse]
 
-    f = f_squeeze.reshape(out_dims)
+    # Broadcast view instead of a tiled copy of the frequency vector
+    f = np.broadcast_to(f.reshape(f.shape + (1,) * phon.ndim), out_dims)
     spl = spl_squeeze.reshape(out_dims)
 
     if sq:
@@ -345,8 +476,54 @@ def iso226(phon, fq=None, sq=False, mirror=0):
     return spl, f, params
 
 
+def iso226_inverse(spl, fq=None, mirror=0, standard="2023"):
+    """
+    Loudness level (phon) of the given SPL values, inverting the iso226 formula in closed form.
+
+    Parameters:
+    spl : array-like
+        Sound pressure levels in dB SPL.
+    fq : array-like, optional
+        Frequencies of the SPL values; broadcast against spl. Defaults to the
+        frequencies of the parameter table.
+    mirror : int, optional
+        Table index used for the 20 kHz anchor when fq exceeds 12.5 kHz (as in iso226).
+    standard : str, optional
+        Edition (parameter table and formula), "2023" (default) or "2003".
+
+    Returns:
+    phon : numpy.ndarray
+        Loudness levels with the broadcast shape of spl and fq. Levels at or
+        below the hearing threshold T_f map to 0 phon, mirroring the threshold
+        branch of iso226.
+    """
+    spl = np.asarray(spl, dtype=float)
+    assert standard in ISO226_PARAMS, f"Unknown ISO 226 standard: {standard}"
+    params = ISO226_PARAMS[standard]
+
+    if fq is None:
+        alpha_f = params["alpha_f"]
+        L_U = params["L_U"]
+        T_f = params["T_f"]
+    else:
+        # Parameters are evaluated on fq as given and broadcast against spl afterwards
+        f = np.asarray(fq, dtype=float)
+        assert np.all(f >= 0), "Frequencies must be greater than or equal to 0 Hz."
+        alpha_f, L_U, T_f = (
+            p.reshape(f.shape) for p in _contour_parameters(standard, mirror, f.ravel())
+        )
+
+    K, c, D, B_f, offset = _equation_terms(standard, alpha_f, L_U, T_f)
+    A_f = 10 ** ((spl + L_U - offset) * alpha_f / 10)
+    ratio = np.maximum((A_f - B_f) / K + D, 1)
+
+    return np.where(spl > T_f, np.log10(ratio) / c, 0.0)
+
+
 # https://discourse.psychopy.org/t/generating-sound/2325/2
-def normalize_loudness_direct(phon, fq=None, a=0.34, b=111.8):
+def normalize_loudness_direct(
+    phon, fq=None, a=0.34, b=111.8, standard="2023", mirror=0, calibration=None
+):
     # The plot dosnet resemble the ELC , I am not implementing it for now
     """
     Normalize loudness for the given phon level and frequencies, and calculate corresponding volumes.
@@ -360,6 +537,12 @@ def normalize_loudness_direct(phon, fq=None, a=0.34, b=111.8):
         Calibration value for 0.1V RMS (default is 0.34).
     b : float, optional
         dBSPL for 0.1V RMS (default is 111.8).
+    standard : str, optional
+        Edition of ISO 226 (parameter table and formula), "2023" (default) or "2003".
+    mirror : int, optional
+        Table index used for the 20 kHz anchor above 12.5 kHz (as in iso226).
+    calibration : DeviceCalibration, optional
+        Measured per-frequency device response; replaces a and b when given.
 
     Returns:
     volumes : array-like
@@ -368,32 +551,149 @@ def normalize_loudness_direct(phon, fq=None, a=0.34, b=111.8):
         Frequencies corresponding to the calculated volumes.
     """
     # Get SPL values for the given phon level and frequencies
-    spl, frequencies, _ = iso226(phon, fq)
+    spl, frequencies, _ = iso226(phon, fq, mirror=mirror, standard=standard)
     # Calculate volume for each SPL value using the calibration formula
-    volumes = ((a / 0.1) / (10 ** (b / 20))) * (10 ** (spl / 20))
+    if calibration is None:
+        gain = (a / 0.1) / (10 ** (b / 20))
+    else:
+        # Per-frequency gain, cached by the calibration and broadcast over phon
+        gain = calibration.gain(frequencies[..., 0])[..., np.newaxis]
+    volumes = gain * (10 ** (spl / 20))
 
     return volumes, frequencies
 
 
-def plot_equal_loudness_curves(frequencies, spl):
+def volume_to_spl(volume, a=0.34, b=111.8):
     """
-    Plot equal-loudness contours for given frequencies and SPL values.
+    Invert the calibration formula of normalize_loudness_direct: dB SPL produced by a volume setting.
+
+    Combine with iso226_inverse to express slider volumes in phon.
+    """
+    return b + 20 * np.log10(np.asarray(volume, dtype=float) * 0.1 / a)
+
+
+class ContourEvaluator:
+    """
+    Allocation-free iso226 / normalize_loudness_direct for a fixed frequency vector.
+
+    The per-frequency terms of the A_f formula are evaluated once in the
+    constructor, and every call works in place on preallocated buffers or on
+    caller-supplied out= arrays, so a hot loop over scalar phon levels does no
+    heap allocation.
 
     Parameters:
-    frequencies (numpy.ndarray): Frequencies for the loudness contours.
-    spl (numpy.ndarray): SPL values corresponding to the frequencies.
+    fq : array-like
+        Frequencies (flattened) to evaluate.
+    mirror, standard :
+        As in iso226.
+    a, b : float, optional
+        Calibration pair used by volumes (as in normalize_loudness_direct).
+    calibration : DeviceCalibration, optional
+        Measured per-frequency device response; replaces a and b when given.
+    dtype : numpy dtype, optional
+        np.float64 (default) or np.float32 for the buffers and results.
     """
-    plt.figure(figsize=(10, 6))
 
-    plt.plot(frequencies.flatten(), spl.flatten(), label="Equal-Loudness Contours")
+    def __init__(
+        self,
+        fq,
+        mirror=0,
+        standard="2023",
+        a=0.34,
+        b=111.8,
+        calibration=None,
+        dtype=np.float64,
+    ):
+        assert standard in ISO226_PARAMS, f"Unknown ISO 226 standard: {standard}"
+        f = np.asarray(fq, dtype=float).ravel()
+        assert np.all(f >= 0), "Frequencies must be greater than or equal to 0 Hz."
+        alpha_f, L_U, T_f = _contour_parameters(standard, mirror, f)
 
-    plt.xscale("log")
-    plt.xlabel("Frequency (Hz)")
-    plt.ylabel("SPL (dB)")
-    plt.title("Equal-Loudness Contours")
-    plt.legend()
-    plt.grid(True)
-    plt.show()
+        self.dtype = np.dtype(dtype)
+        self.frequencies = f.astype(self.dtype)
+        # spl = (10 / alpha_f) * log10(A_f) + (offset - L_U),
+        # A_f = K * (10 ** (c * phon) - D) + B_f (see _equation_terms)
+        K, self._c, self._D, B_f, offset = _equation_terms(standard, alpha_f, L_U, T_f)
+        self._K = K.astype(self.dtype)
+        self._B_f = B_f.astype(self.dtype)
+        self._scale = (10 / alpha_f).astype(self.dtype)
+        self._offset = (offset - L_U).astype(self.dtype)
+        self._T_f = T_f.astype(self.dtype)
+        # Column views for the phon-array path, created once
+        self._K_col = self._K[:, np.newaxis]
+        self._B_col = self._B_f[:, np.newaxis]
+        self._scale_col = self._scale[:, np.newaxis]
+        self._offset_col = self._offset[:, np.newaxis]
+        self._T_col = self._T_f[:, np.newaxis]
+
+        if calibration is None:
+            self._gain = float((a / 0.1) / (10 ** (b / 20)))
+            self._gain_col = self._gain
+        else:
+            self._gain = calibration.gain(f).astype(self.dtype)
+            self._gain_col = self._gain[:, np.newaxis]
+        self._buffer = np.empty(len(f), dtype=self.dtype)
+        self._phon_buffer = np.empty(0, dtype=self.dtype)
+
+    def spl(self, phon, out=None):
+        """
+        SPL for a scalar phon level (shape (n_freq,)) or a 1-D array of levels (shape (n_freq, n_phon)).
+
+        Without out=, scalar levels are written to an internal buffer that the
+        next call overwrites.
+        """
+        if np.ndim(phon) == 0:
+            if out is None:
+                out = self._buffer
+            phon = float(phon)
+            if phon > 0:
+                np.multiply(self._K, (10 ** (self._c * phon)) - self._D, out=out)
+                np.add(out, self._B_f, out=out)
+                np.log10(out, out=out)
+                np.multiply(out, self._scale, out=out)
+                np.add(out, self._offset, out=out)
+            else:
+                np.copyto(out, self._T_f)
+            return out
+
+        n_phon = len(phon)
+        if out is None:
+            out = np.empty((len(self._B_f), n_phon), dtype=self.dtype)
+        if len(self._phon_buffer) < n_phon:
+            self._phon_buffer = np.empty(n_phon, dtype=self.dtype)
+        c = self._phon_buffer[:n_phon]
+
+        # The phon-dependent part of A_f is computed once per level, not per cell
+        np.multiply(phon, self._c, out=c)
+        np.power(10, c, out=c)
+        np.subtract(c, self._D, out=c)
+        np.multiply(self._K_col, c, out=out)
+        np.add(out, self._B_col, out=out)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            np.log10(out, out=out)
+        np.multiply(out, self._scale_col, out=out)
+        np.add(out, self._offset_col, out=out)
+        if np.min(phon) <= 0:
+            np.copyto(out, self._T_col, where=np.less_equal(phon, 0))
+        return out
+
+    def volumes(self, phon, out=None):
+        """normalize_loudness_direct volumes, computed in place on top of spl(phon, out)."""
+        out = self.spl(phon, out=out)
+        np.multiply(out, np.log(10) / 20, out=out)
+        np.exp(out, out=out)
+        np.multiply(out, self._gain if out.ndim == 1 else self._gain_col, out=out)
+        return out
+
+
+def __getattr__(name):
+    # Plotting lives in equal_loudness_plot so that importing the numeric core
+    # never loads matplotlib; the old name still resolves on first access.
+    if name == "plot_equal_loudness_curves":
+        from equal_loudness_plot import plot_equal_loudness_curves
+
+        return plot_equal_loudness_curves
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
 
 if __name__ == "__main__":
@@ -411,5 +711,9 @@ if __name__ == "__main__":
     # Plotting equal loudness contours
     phon_levels = [phon_level]
     spl, freqs, params = iso226(phon_levels, fq=frequencies)
+
+    import matplotlib.pyplot as plt
+    from equal_loudness_plot import plot_equal_loudness_curves
+
     plt.plot(frequencies, normalized_volume)
     plot_equal_loudness_curves(freqs, spl)
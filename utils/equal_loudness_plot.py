@@ -0,0 +1,169 @@
+"""
+Plotting of equal-loudness contours.
+
+plot_equal_loudness_curves shows a single interactive figure. For reports,
+ContourFigureRenderer draws on a headless Agg canvas: the contours are one
+LineCollection, and one figure and axes are reused for every participant,
+so each extra figure only updates the data and saves the file.
+render_contour_figures spreads long job lists over a process pool, with one
+renderer per worker.
+"""
+
+import os
+from collections import namedtuple
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+from matplotlib.collections import LineCollection
+from matplotlib.figure import Figure
+
+# One output figure: the participant's adjusted points (optional) on the shared contours
+FigureJob = namedtuple(
+    "FigureJob", ["path", "frequencies", "spl", "title"], defaults=(None, None, None)
+)
+
+
+def plot_equal_loudness_curves(frequencies, spl):
+    """
+    Plot equal-loudness contours for given frequencies and SPL values.
+
+    Parameters:
+    frequencies (numpy.ndarray): Frequencies for the loudness contours.
+    spl (numpy.ndarray): SPL values corresponding to the frequencies.
+    """
+    import matplotlib.pyplot as plt
+
+    plt.figure(figsize=(10, 6))
+
+    plt.plot(frequencies.flatten(), spl.flatten(), label="Equal-Loudness Contours")
+
+    plt.xscale("log")
+    plt.xlabel("Frequency (Hz)")
+    plt.ylabel("SPL (dB)")
+    plt.title("Equal-Loudness Contours")
+    plt.legend()
+    plt.grid(True)
+    plt.show()
+
+
+class ContourFigureRenderer:
+    """
+    Headless renderer that reuses one figure for many contour plots.
+
+    Parameters:
+    frequencies : numpy.ndarray
+        Contour frequencies, shape (n_freq,) or (n_freq, n_phon) as returned
+        by iso226.
+    spl : numpy.ndarray
+        Contour SPL values as returned by iso226, one column per phon level,
+        shape (n_freq, n_phon).
+    phon : array-like, optional
+        Phon level of each column; the contours are then coloured by level.
+    figsize, dpi :
+        Passed to matplotlib.figure.Figure.
+    cmap : str, optional
+        Colormap for the phon levels.
+    """
+
+    def __init__(
+        self, frequencies, spl, phon=None, figsize=(10, 6), dpi=100, cmap="viridis"
+    ):
+        spl = np.asarray(spl, dtype=float).reshape(len(spl), -1)
+        frequencies = np.asarray(frequencies, dtype=float)
+        frequencies = np.broadcast_to(
+            frequencies.reshape(len(frequencies), -1), spl.shape
+        )
+        self._contour_limits = (np.nanmin(spl), np.nanmax(spl))
+
+        self.figure = Figure(figsize=figsize, dpi=dpi)
+        FigureCanvasAgg(self.figure)
+        self.ax = self.figure.add_subplot()
+
+        self.contours = LineCollection(
+            np.stack([frequencies.T, spl.T], axis=-1), linewidths=1.0, cmap=cmap
+        )
+        if phon is not None:
+            self.contours.set_array(np.asarray(phon, dtype=float))
+            self.figure.colorbar(self.contours, ax=self.ax, label="Loudness (phon)")
+        else:
+            self.contours.set_color("C0")
+        self.ax.add_collection(self.contours)
+        (self.points,) = self.ax.plot([], [], "o", color="C3", label="Adjusted")
+
+        self.ax.set_xscale("log")
+        self.ax.set_xlim(np.nanmin(frequencies), np.nanmax(frequencies))
+        self.ax.set_xlabel("Frequency (Hz)")
+        self.ax.set_ylabel("SPL (dB)")
+        self.ax.grid(True, which="both", alpha=0.3)
+
+    def render(self, path, frequencies=None, spl=None, title=None):
+        """Draw the adjusted points (if any) over the contours and save the figure to path."""
+        if frequencies is None:
+            self.points.set_data([], [])
+            low, high = self._contour_limits
+        else:
+            spl = np.asarray(spl, dtype=float)
+            self.points.set_data(frequencies, spl)
+            low = min(self._contour_limits[0], np.nanmin(spl))
+            high = max(self._contour_limits[1], np.nanmax(spl))
+        margin = 0.05 * (high - low) or 1.0
+        self.ax.set_ylim(low - margin, high + margin)
+        self.ax.set_title(title or "Equal-Loudness Contours")
+        self.figure.savefig(path)
+
+
+_worker_renderer = None
+
+
+def _init_worker(frequencies, spl, phon, figure_kwargs):
+    global _worker_renderer
+    _worker_renderer = ContourFigureRenderer(frequencies, spl, phon, **figure_kwargs)
+
+
+def _render_chunk(jobs):
+    for job in jobs:
+        _worker_renderer.render(*job)
+    return len(jobs)
+
+
+def render_contour_figures(
+    jobs, frequencies, spl, phon=None, processes=None, parallel_threshold=32, **kwargs
+):
+    """
+    Render one figure file per job on the same contours.
+
+    Parameters:
+    jobs : iterable of FigureJob or (path, frequencies, spl, title) tuples
+        Output file (format from the extension) and the participant's points.
+    frequencies, spl, phon :
+        Contours shared by all figures, see ContourFigureRenderer.
+    processes : int, optional
+        Worker processes (default os.cpu_count()); 1 renders in this process.
+    parallel_threshold : int, optional
+        Fewer jobs than this are rendered in this process, as starting the
+        workers would cost more than it saves.
+    kwargs :
+        figsize, dpi and cmap for ContourFigureRenderer.
+
+    Returns:
+    int
+        Number of figures written.
+    """
+    jobs = [FigureJob(*job) for job in jobs]
+    processes = processes or os.cpu_count() or 1
+    if processes == 1 or len(jobs) < parallel_threshold:
+        renderer = ContourFigureRenderer(frequencies, spl, phon, **kwargs)
+        for job in jobs:
+            renderer.render(*job)
+        return len(jobs)
+
+    # One chunk per worker, so every worker reuses its figure for all of its jobs
+    processes = min(processes, len(jobs))
+    chunks = [jobs[i::processes] for i in range(processes)]
+    with ProcessPoolExecutor(
+        max_workers=processes,
+        initializer=_init_worker,
+        initargs=(frequencies, spl, phon, kwargs),
+    ) as executor:
+        return sum(executor.map(_render_chunk, chunks))
@@ -0,0 +1,297 @@
+"""
+Equal-loudness compensation filters for streaming audio.
+
+The filters apply the same per-frequency gain that normalize_loudness_direct
+applies to single tones: the magnitude response follows the chosen phon
+contour relative to a reference frequency. Frequencies where the ear is less
+sensitive are boosted, so a broadband stimulus is loudness-equalized as a whole.
+
+design_fir returns a linear-phase FIR (frequency sampling + Kaiser window),
+design_iir a minimum-phase IIR (second-order sections, needs SciPy) fitted to
+the same target, and both designs are
+cached per (phon, sample rate, length/order, ...). LoudnessCompensationFilter
+and FIRStream keep filter state across process(block) calls, so a signal can be
+filtered chunk by chunk with the same result as filtering it in one go.
+"""
+
+import sys
+from functools import lru_cache
+
+import numpy as np
+
+from equal_loudness_contor_2023ISO_params import iso226
+from wav_io import read_wav
+
+
+def compensation_gain_db(
+    phon, freqs, standard="2023", max_gain_db=30.0, ref_frequency=1000.0
+):
+    """
+    Target gain (dB) of the compensation filter at freqs.
+
+    The gain is the contour SPL relative to its value at ref_frequency, capped at
+    max_gain_db. Frequencies outside 20 Hz-20 kHz hold the edge values. Up to
+    12.5 kHz the contour is iso226 at each frequency on its own; the 20 kHz
+    anchor of a design grid only shapes the gains above 12.5 kHz.
+    """
+    f = np.clip(np.asarray(freqs, dtype=float), 20, 20000)
+    spl, _, _ = iso226(phon, np.append(f, ref_frequency), standard=standard)
+    spl = spl[:, 0]
+    return np.minimum(spl[:-1] - spl[-1], max_gain_db)
+
+
+def frequency_sampling_fir(magnitude, fs, numtaps, beta=6.0):
+    """
+    Linear-phase FIR of numtaps coefficients by frequency sampling.
+
+    Parameters:
+    magnitude : callable
+        magnitude(freqs) -> linear gain at freqs (Hz), sampled on an rfft grid
+        of at least 4 * numtaps points.
+    fs : int
+        Sample rate in Hz.
+    numtaps : int
+        Filter length; odd for an integer group delay of (numtaps - 1) / 2.
+    beta : float, optional
+        Kaiser window parameter applied to the truncated impulse response.
+    """
+    n_fft = 1 << int(np.ceil(np.log2(4 * numtaps)))
+    h = np.fft.irfft(magnitude(np.fft.rfftfreq(n_fft, 1 / fs)), n_fft)
+    # Zero-phase impulse response, centred and truncated to numtaps
+    return np.roll(h, (numtaps - 1) // 2)[:numtaps] * np.kaiser(numtaps, beta)
+
+
+@lru_cache(maxsize=32)
+def design_fir(
+    phon, fs, numtaps=4097, standard="2023", max_gain_db=30.0, ref_frequency=1000.0
+):
+    """
+    Linear-phase FIR compensation filter (read-only array of numtaps coefficients).
+
+    numtaps should be odd so the group delay, (numtaps - 1) / 2 samples, is an integer.
+    """
+
+    def magnitude(freqs):
+        gain_db = compensation_gain_db(
+            phon, freqs, standard, max_gain_db, ref_frequency
+        )
+        return 10 ** (gain_db / 20)
+
+    h = frequency_sampling_fir(magnitude, fs, numtaps)
+    h.setflags(write=False)
+    return h
+
+
+@lru_cache(maxsize=32)
+def design_iir(
+    phon,
+    fs,
+    order=16,
+    standard="2023",
+    max_gain_db=30.0,
+    ref_frequency=1000.0,
+    warping=0.6,
+    n_iter=10,
+):
+    """
+    Minimum-phase IIR compensation filter as read-only second-order sections.
+
+    The target's minimum-phase spectrum is obtained from its real cepstrum and
+    fitted with Steiglitz-McBride iterations on a frequency axis warped by a
+    first-order allpass (coefficient `warping`), which spreads the poles
+    evenly on a roughly logarithmic scale. Poles and zeros are then mapped
+    back to the linear frequency axis one by one and paired into sections;
+    expanding them to a single polynomial would lose precision at high orders.
+    Poles that end up outside the unit circle are reflected inside, which
+    keeps the magnitude response.
+    """
+    from scipy import signal
+
+    n_fft = 1 << 16
+    freqs = np.fft.rfftfreq(n_fft, 1 / fs)
+    log_magnitude = (
+        compensation_gain_db(phon, freqs, standard, max_gain_db, ref_frequency)
+        * np.log(10)
+        / 20
+    )
+
+    # Fold the real cepstrum onto positive quefrencies -> minimum phase
+    cepstrum = np.fft.irfft(log_magnitude, n_fft)
+    fold = np.zeros(n_fft)
+    fold[0] = fold[n_fft // 2] = 1
+    fold[1 : n_fft // 2] = 2
+    H_min = np.exp(np.fft.rfft(cepstrum * fold))
+
+    # Uniform grid on the warped axis, sampled from the target at the matching frequencies
+    w_warped = np.linspace(0, np.pi, 514)[1:-1]
+    w = w_warped - 2 * np.arctan2(
+        warping * np.sin(w_warped), 1 + warping * np.cos(w_warped)
+    )
+    H = H_min[np.round(w / (2 * np.pi) * n_fft).astype(int)]
+    E = np.exp(-1j * np.outer(w_warped, np.arange(order + 1)))
+
+    a = np.zeros(order + 1)
+    a[0] = 1.0
+    for _ in range(n_iter):
+        # Equation error B - H * A, weighted by 1 / |A_prev| (Steiglitz-McBride)
+        weight = 1 / np.abs(E @ a)
+        M = np.hstack([E, -H[:, np.newaxis] * E[:, 1:]]) * weight[:, np.newaxis]
+        rhs = H * weight
+        solution, *_ = np.linalg.lstsq(
+            np.vstack([M.real, M.imag]),
+            np.concatenate([rhs.real, rhs.imag]),
+            rcond=None,
+        )
+        b = solution[: order + 1]
+        a = np.concatenate([[1.0], solution[order + 1 :]])
+
+        poles = np.roots(a)
+        unstable = np.abs(poles) >= 1
+        if np.any(unstable):
+            # Reflecting p -> 1 / conj(p) scales |A| by |p| at every frequency
+            b = b / np.prod(np.abs(poles[unstable]))
+            poles[unstable] = 1 / np.conj(poles[unstable])
+            a = np.real(np.poly(poles))
+
+    # Undo the warping root by root: z = (z_w + warping) / (1 + warping * z_w)
+    zeros = np.roots(b)
+    poles = np.roots(a)
+    zeros = (zeros + warping) / (1 + warping * zeros)
+    poles = (poles + warping) / (1 + warping * poles)
+    sos = signal.zpk2sos(zeros, poles, 1.0)
+
+    # Set the overall gain from the target at the reference frequency
+    w_ref = 2 * np.pi * ref_frequency / fs
+    _, h_ref = signal.sosfreqz(sos, [w_ref])
+    sos[0, :3] *= np.abs(H_min[int(round(ref_frequency / fs * n_fft))]) / np.abs(
+        h_ref[0]
+    )
+    sos.setflags(write=False)
+    return sos
+
+
+class FIRStream:
+    """
+    Block-streaming FIR filter (FFT overlap-add) that carries its tail across calls.
+
+    Blocks are (n,) or (n, channels) arrays; the channel layout is fixed by the
+    first block until reset().
+    """
+
+    def __init__(self, h):
+        self.h = np.asarray(h, dtype=float)
+        self._spectra = {}
+        self._tail = None
+
+    def reset(self):
+        self._tail = None
+
+    def process(self, block):
+        block = np.asarray(block, dtype=float)
+        n = block.shape[0]
+        n_h = len(self.h)
+        n_fft = 1 << int(np.ceil(np.log2(n + n_h - 1)))
+        if n_fft not in self._spectra:
+            self._spectra[n_fft] = np.fft.rfft(self.h, n_fft)
+        H = self._spectra[n_fft].reshape((-1,) + (1,) * (block.ndim - 1))
+
+        y = np.fft.irfft(np.fft.rfft(block, n_fft, axis=0) * H, n_fft, axis=0)
+        y = y[: n + n_h - 1]
+        if self._tail is None:
+            self._tail = np.zeros((n_h - 1,) + block.shape[1:])
+        y[: n_h - 1] += self._tail
+        self._tail = y[n:].copy()
+        return y[:n]
+
+
+class _SOSStream:
+    # Second-order-section IIR that carries its state across calls (needs SciPy)
+
+    def __init__(self, sos):
+        from scipy import signal
+
+        self._signal = signal
+        self.sos = np.array(sos)
+        self._zi = None
+
+    def reset(self):
+        self._zi = None
+
+    def process(self, block):
+        block = np.asarray(block, dtype=float)
+        if self._zi is None:
+            self._zi = np.zeros((len(self.sos), 2) + block.shape[1:])
+        y, self._zi = self._signal.sosfilt(self.sos, block, axis=0, zi=self._zi)
+        return y
+
+
+class LoudnessCompensationFilter:
+    """
+    Streaming equal-loudness compensation at a given phon level.
+
+    Parameters:
+    phon : float
+        Loudness level of the contour to compensate for.
+    fs : int
+        Sample rate of the audio in Hz.
+    kind : str, optional
+        "fir" (linear phase, default) or "iir" (minimum phase).
+    numtaps : int, optional
+        FIR length (kind="fir").
+    order : int, optional
+        IIR order (kind="iir").
+    standard, max_gain_db, ref_frequency :
+        Passed to the cached design functions.
+    """
+
+    def __init__(
+        self,
+        phon,
+        fs,
+        kind="fir",
+        numtaps=4097,
+        order=16,
+        standard="2023",
+        max_gain_db=30.0,
+        ref_frequency=1000.0,
+    ):
+        if kind == "fir":
+            self.coefficients = design_fir(
+                phon, fs, numtaps, standard, max_gain_db, ref_frequency
+            )
+            self._stream = FIRStream(self.coefficients)
+            self.latency = (numtaps - 1) // 2
+        elif kind == "iir":
+            self.coefficients = design_iir(
+                phon, fs, order, standard, max_gain_db, ref_frequency
+            )
+            self._stream = _SOSStream(self.coefficients)
+            self.latency = 0
+        else:
+            raise ValueError(f"Unknown filter kind: {kind}")
+        self.kind = kind
+        self.fs = fs
+
+    def process(self, block):
+        """Filter one block of samples, (n,) or (n, channels), continuing from the previous block."""
+        return self._stream.process(block)
+
+    def reset(self):
+        """Clear the filter state before starting an unrelated signal."""
+        self._stream.reset()
+
+
+if __name__ == "__main__":
+    path = sys.argv[1] if len(sys.argv) > 1 else "tones/noise.wav"
+    samples, fs = read_wav(path, dtype=np.float64)
+
+    compensation = LoudnessCompensationFilter(phon=60, fs=fs)
+    block_size = 1024
+    equalized = np.concatenate(
+        [
+            compensation.process(samples[start : start + block_size])
+            for start in range(0, len(samples), block_size)
+        ]
+    )
+    print("Input RMS:", np.sqrt(np.mean(samples**2)))
+    print("Equalized RMS:", np.sqrt(np.mean(equalized**2)))
@@ -0,0 +1,411 @@
+"""
+Zwicker loudness (ISO 532-1, stationary method) for arbitrary stimulus files.
+
+Third-octave band levels are computed with a framed FFT, and the core-loudness
+and upper-slope stages of ISO 532-1 then run vectorized over frames, so a
+whole file is processed in a few array passes. Total loudness is reported in
+sone and as a loudness level in phon, which is on the same scale as iso226:
+a 1 kHz tone at L dB SPL reads close to L phon for the levels the contours cover.
+
+Digital samples are converted to dB SPL with the calibration of
+normalize_loudness_direct (volume_to_spl): a full-scale sine (RMS 1 / sqrt(2)),
+like the tone files, played at volume v produces volume_to_spl(v, a, b) dB SPL,
+so a tone at the volume normalize_loudness_direct returns for L phon reads
+close to L phon.
+
+Notes:
+    The band levels come from FFT bins weighted by the power response of
+    third-order Butterworth third-octave filters (band_responses), not from
+    the standard's time-domain filter bank.
+    loudness_time_varying applies the stationary model frame by frame. The
+    temporal post-processing of the ISO 532-1 time-varying method (nonlinear
+    decay and temporal weighting) is not applied.
+"""
+
+import os
+import sys
+
+import numpy as np
+
+from equal_loudness_contor_2023ISO_params import volume_to_spl
+from wav_io import read_wav
+
+# Nominal third-octave bands 25 Hz - 12.5 kHz
+BAND_CENTERS = 1000 * 2 ** (np.arange(-16, 12) / 3)
+
+# ISO 532-1 tables
+# Level ranges and reductions of the 1/3 octave levels below 315 Hz
+RAP = np.array([45, 55, 65, 71, 80, 90, 100, 120])
+DLL = np.array(
+    [
+        [-32, -24, -16, -10, -5, 0, -7, -3, 0, -2, 0],
+        [-29, -22, -15, -10, -4, 0, -7, -2, 0, -2, 0],
+        [-27, -19, -14, -9, -4, 0, -6, -2, 0, -2, 0],
+        [-25, -17, -12, -9, -3, 0, -5, -2, 0, -2, 0],
+        [-23, -16, -11, -7, -3, 0, -4, -1, 0, -1, 0],
+        [-20, -14, -10, -6, -3, 0, -4, -1, 0, -1, 0],
+        [-18, -12, -9, -6, -2, 0, -3, -1, 0, -1, 0],
+        [-15, -10, -8, -4, -2, 0, -3, -1, 0, -1, 0],
+    ]
+)
+# Critical band level at the threshold in quiet
+LTQ = np.array([30, 18, 12, 8, 7, 6, 5, 4, 3, 3, 3, 3, 3, 3, 3, 3, 3, 3, 3, 3])
+# Transmission of the outer ear (free field)
+A0 = np.array(
+    [0, 0, 0, 0, 0, 0, 0, 0, 0, 0, -0.5, -1.6, -3.2, -5.4, -5.6, -4, -1.5, 2, 5, 12]
+)
+# Level differences between diffuse and free field
+DDF = np.array(
+    [0, 0, 0.5, 0.9, 1.2, 1.6, 2.3, 2.8, 3, 2, 0, -1.4, -2, -1.9, -1, 0.5, 3, 4, 4.3, 4]
+)
+# Adaptation of 1/3 octave band levels to critical band levels
+DCB = np.array(
+    [
+        -0.25,
+        -0.6,
+        -0.8,
+        -0.8,
+        -0.5,
+        0,
+        0.5,
+        1.1,
+        1.5,
+        1.7,
+        1.8,
+        1.8,
+        1.7,
+        1.6,
+        1.4,
+        1.2,
+        0.8,
+        0.5,
+        0,
+        -0.5,
+    ]
+)
+# Upper limits of the approximated critical bands (Bark)
+ZUP = np.array(
+    [
+        0.9,
+        1.8,
+        2.8,
+        3.5,
+        4.4,
+        5.4,
+        6.6,
+        7.9,
+        9.2,
+        10.6,
+        12.3,
+        13.8,
+        15.2,
+        16.7,
+        18.1,
+        19.3,
+        20.6,
+        21.8,
+        22.7,
+        23.6,
+        24.0,
+    ]
+)
+# Specific loudness ranges and the upper-slope steepness for each range and band
+RNS = np.array(
+    [
+        21.5,
+        18,
+        15.1,
+        11.5,
+        9,
+        6.1,
+        4.4,
+        3.1,
+        2.13,
+        1.36,
+        0.82,
+        0.42,
+        0.30,
+        0.22,
+        0.15,
+        0.10,
+        0.035,
+        0,
+    ]
+)
+USL = np.array(
+    [
+        [13, 8.2, 6.3, 5.5, 5.5, 5.5, 5.5, 5.5],
+        [9, 7.5, 6, 5.1, 4.5, 4.5, 4.5, 4.5],
+        [7.8, 6.7, 5.6, 4.9, 4.4, 3.9, 3.9, 3.9],
+        [6.2, 5.4, 4.6, 4.0, 3.5, 3.2, 3.2, 3.2],
+        [4.5, 3.8, 3.6, 3.2, 2.9, 2.7, 2.7, 2.7],
+        [3.7, 3.0, 2.8, 2.35, 2.2, 2.2, 2.2, 2.2],
+        [2.9, 2.3, 2.1, 1.9, 1.8, 1.7, 1.7, 1.7],
+        [2.4, 1.7, 1.5, 1.35, 1.3, 1.3, 1.3, 1.3],
+        [1.95, 1.45, 1.3, 1.15, 1.1, 1.1, 1.1, 1.1],
+        [1.5, 1.2, 0.94, 0.86, 0.82, 0.82, 0.82, 0.82],
+        [0.72, 0.67, 0.64, 0.63, 0.62, 0.62, 0.62, 0.62],
+        [0.59, 0.53, 0.51, 0.50, 0.42, 0.42, 0.42, 0.42],
+        [0.40, 0.33, 0.26, 0.24, 0.24, 0.22, 0.22, 0.22],
+        [0.27, 0.21, 0.20, 0.18, 0.17, 0.17, 0.17, 0.17],
+        [0.16, 0.15, 0.14, 0.12, 0.11, 0.11, 0.11, 0.11],
+        [0.12, 0.11, 0.10, 0.08, 0.08, 0.08, 0.08, 0.08],
+        [0.09, 0.08, 0.07, 0.06, 0.06, 0.06, 0.06, 0.05],
+        [0.06, 0.05, 0.03, 0.02, 0.02, 0.02, 0.02, 0.02],
+    ]
+)
+
+# Specific loudness is sampled every 0.1 Bark
+BARK_AXIS = np.round(np.arange(1, 241) * 0.1, 1)
+
+
+def unit_rms_level(volume, a=0.34, b=111.8):
+    """dB SPL of a digital signal with RMS 1.0 played at `volume` (see module notes)."""
+    return volume_to_spl(volume, a, b) + 20 * np.log10(np.sqrt(2))
+
+
+def band_responses(frame_length, fs):
+    """
+    Power response of the 28 third-octave filters at the rfft bins of a frame.
+
+    Third-order Butterworth band-passes (-3 dB at the nominal band edges), the
+    filter class of the ISO 532-1 filter bank. Brick-wall bands would put all
+    of a pure tone into one band; the skirts let it excite the neighbouring
+    bands as the standard's filters do, which the loudness of tones relies on.
+    """
+    freqs = np.fft.rfftfreq(frame_length, 1 / fs)
+    bandwidth = 2 ** (1 / 6) - 2 ** (-1 / 6)
+    with np.errstate(divide="ignore"):
+        ratio = freqs[:, np.newaxis] / BAND_CENTERS
+        return 1 / (1 + ((ratio - 1 / ratio) / bandwidth) ** 6)
+
+
+def third_octave_levels(samples, fs, level_offset, frame_length=8192, hop=None):
+    """
+    Third-octave band levels (dB SPL) of a mono signal.
+
+    Parameters:
+    samples : array-like
+        Digital samples (mono).
+    fs : int
+        Sample rate in Hz.
+    level_offset : float
+        dB SPL of a unit-RMS signal, e.g. from unit_rms_level.
+    frame_length : int, optional
+        FFT frame length; long frames resolve the lowest bands. Shorter signals
+        are analysed as a single zero-padded frame.
+    hop : int, optional
+        Frame step. Without it the power spectra of half-overlapping frames
+        are averaged into a single spectrum (Welch), and the result has shape
+        (28,). With it, the result has shape (n_frames, 28).
+    """
+    samples = np.asarray(samples, dtype=float)
+    # Signals shorter than a frame (e.g. the 50 ms tones) are one window, zero-padded in the FFT
+    window_length = min(frame_length, len(samples))
+    step = hop or window_length // 2
+    frames = np.lib.stride_tricks.sliding_window_view(samples, window_length)[::step]
+
+    window = np.hanning(window_length)
+    spectra = np.fft.rfft(frames * window, frame_length, axis=-1)
+    # Scale so that the bins of a frame sum to its mean square
+    power = np.abs(spectra) ** 2 * (2 / (np.sum(window**2) * frame_length))
+    power[:, 0] /= 2
+    if frame_length % 2 == 0:
+        power[:, -1] /= 2
+    if hop is None:
+        power = power.mean(axis=0)
+
+    band_power = power @ band_responses(frame_length, fs)
+    with np.errstate(divide="ignore"):
+        return 10 * np.log10(band_power) + level_offset
+
+
+def _core_loudness(levels, field):
+    # Core loudness of the 20 critical bands (+ a trailing zero band) for levels (..., 28)
+    levels = np.asarray(levels, dtype=float)
+
+    # Low-frequency correction: the level range picks the row of DLL
+    low = levels[..., :11]
+    above = low[..., np.newaxis, :] > (RAP[:-1, np.newaxis] - DLL[:-1])
+    row = np.cumprod(above, axis=-2).sum(axis=-2)
+    intensity = 10 ** ((low + DLL[row, np.arange(11)]) / 10)
+
+    # The lowest 11 third-octave bands form three critical bands
+    grouped = np.stack(
+        [
+            intensity[..., 0:6].sum(axis=-1),
+            intensity[..., 6:9].sum(axis=-1),
+            intensity[..., 9:11].sum(axis=-1),
+        ],
+        axis=-1,
+    )
+    with np.errstate(divide="ignore"):
+        excitation = np.concatenate([10 * np.log10(grouped), levels[..., 11:]], axis=-1)
+    excitation = excitation - A0
+    if field == "diffuse":
+        excitation = excitation + DDF
+
+    audible = excitation > LTQ
+    excitation = np.where(audible, excitation - DCB, LTQ)
+    core = (
+        0.0635
+        * 10 ** (0.025 * LTQ)
+        * ((1 - 0.25 + 0.25 * 10 ** ((excitation - LTQ) / 10)) ** 0.25 - 1)
+    )
+    core = np.where(audible, np.maximum(core, 0), 0)
+
+    # Threshold dependence within the lowest critical band
+    core[..., 0] *= np.minimum(0.4 + 0.32 * core[..., 0] ** 0.2, 1)
+    return np.concatenate([core, np.zeros(core.shape[:-1] + (1,))], axis=-1)
+
+
+def _apply_slopes(core):
+    # Total loudness and specific loudness pattern; the Bark walk is sequential,
+    # every step runs for all frames at once
+    n_frames = core.shape[0]
+    usl = np.concatenate([USL, np.repeat(USL[:, -1:], len(ZUP) - 8, axis=1)], axis=1)
+    rns_ascending = RNS[::-1]
+
+    total = np.zeros(n_frames)
+    specific = np.zeros((n_frames, len(BARK_AXIS)))
+    n1 = np.zeros(n_frames)
+    z1 = np.zeros(n_frames)
+
+    for i, z_upper in enumerate(ZUP):
+        column = usl[:, max(i - 1, 0)]
+        nm = core[:, i]
+        active = np.ones(n_frames, dtype=bool)
+        while np.any(active):
+            falling = active & (np.round(n1, 8) > np.round(nm, 8))
+            plateau = active & ~falling
+
+            # Range of the current value selects the steepness of the upper slope
+            j = np.minimum(len(RNS) - np.searchsorted(rns_ascending, n1), len(RNS) - 1)
+            steepness = column[j]
+            n2 = np.where(falling, np.maximum(RNS[j], nm), nm)
+            z2 = np.where(falling, z1 + (n1 - n2) / steepness, z_upper)
+            clipped = z2 > z_upper
+            z2 = np.where(clipped, z_upper, z2)
+            n2 = np.where(falling & clipped, n1 - (z_upper - z1) * steepness, n2)
+
+            total += np.where(falling, (z2 - z1) * (n1 + n2) / 2, 0)
+            total += np.where(plateau, nm * (z2 - z1), 0)
+
+            in_segment = (
+                active[:, np.newaxis]
+                & (BARK_AXIS > z1[:, np.newaxis] + 1e-9)
+                & (BARK_AXIS <= z2[:, np.newaxis] + 1e-9)
+            )
+            values = np.where(
+                falling[:, np.newaxis],
+                n1[:, np.newaxis]
+                - (BARK_AXIS - z1[:, np.newaxis]) * steepness[:, np.newaxis],
+                nm[:, np.newaxis],
+            )
+            specific = np.where(in_segment, values, specific)
+
+            n1 = np.where(active, n2, n1)
+            z1 = np.where(active, z2, z1)
+            active &= z1 < z_upper - 1e-9
+
+    return np.maximum(total, 0), np.maximum(specific, 0)
+
+
+def zwicker_loudness(band_levels, field="free"):
+    """
+    Loudness from third-octave band levels.
+
+    Parameters:
+    band_levels : array-like
+        dB SPL of the 28 bands 25 Hz - 12.5 kHz, shape (28,) or (n_frames, 28).
+    field : str, optional
+        "free" (default) or "diffuse" sound field.
+
+    Returns:
+    loudness : float or numpy.ndarray
+        Total loudness in sone, one value per frame.
+    specific : numpy.ndarray
+        Specific loudness (sone/Bark) on BARK_AXIS, shape (240,) or (n_frames, 240).
+    """
+    band_levels = np.asarray(band_levels, dtype=float)
+    frames = np.atleast_2d(band_levels)
+    loudness, specific = _apply_slopes(_core_loudness(frames, field))
+    if band_levels.ndim == 1:
+        return loudness[0], specific[0]
+    return loudness, specific
+
+
+def sone_to_phon(loudness):
+    """Loudness level in phon for loudness in sone (ISO 532-1)."""
+    loudness = np.asarray(loudness, dtype=float)
+    with np.errstate(divide="ignore"):
+        return np.where(
+            loudness >= 1,
+            40 + 33.22 * np.log10(np.maximum(loudness, 1)),
+            40 * (loudness + 0.0005) ** 0.35,
+        )
+
+
+def loudness_stationary(samples, fs, volume=0.34, a=0.34, b=111.8, field="free"):
+    """Total loudness (sone), loudness level (phon) and specific loudness of a stationary stimulus."""
+    levels = third_octave_levels(samples, fs, unit_rms_level(volume, a, b))
+    loudness, specific = zwicker_loudness(levels, field)
+    return loudness, sone_to_phon(loudness)[()], specific
+
+
+def loudness_time_varying(
+    samples,
+    fs,
+    volume=0.34,
+    a=0.34,
+    b=111.8,
+    field="free",
+    hop_seconds=0.01,
+    frame_length=8192,
+):
+    """
+    Frame-wise loudness of a time-varying stimulus (see module notes).
+
+    Returns:
+    times : numpy.ndarray
+        Frame centres in seconds.
+    loudness : numpy.ndarray
+        Loudness in sone per frame.
+    phon : numpy.ndarray
+        Loudness level per frame.
+    n5 : float
+        Loudness exceeded 5 % of the time (sone), the usual single-number summary.
+    """
+    hop = max(1, int(round(hop_seconds * fs)))
+    levels = third_octave_levels(
+        samples, fs, unit_rms_level(volume, a, b), frame_length, hop
+    )
+    loudness, _ = zwicker_loudness(levels, field)
+    times = (np.arange(len(loudness)) * hop + min(frame_length, len(samples)) / 2) / fs
+    return times, loudness, sone_to_phon(loudness), np.percentile(loudness, 95)
+
+
+def read_wav_mono(path):
+    """Samples of a PCM WAV file as floats in [-1, 1), channels averaged, and its sample rate."""
+    samples, fs = read_wav(path, dtype=np.float64)
+    if samples.ndim > 1:
+        samples = samples.mean(axis=1)
+    return samples, fs
+
+
+def analyse_directory(directory, volume=0.34, a=0.34, b=111.8, field="free"):
+    """Stationary loudness of every WAV file in a directory: {filename: (sone, phon)}."""
+    results = {}
+    for filename in sorted(os.listdir(directory)):
+        if filename.lower().endswith(".wav"):
+            samples, fs = read_wav_mono(os.path.join(directory, filename))
+            loudness, phon, _ = loudness_stationary(samples, fs, volume, a, b, field)
+            results[filename] = (float(loudness), float(phon))
+    return results
+
+
+if __name__ == "__main__":
+    directory = sys.argv[1] if len(sys.argv) > 1 else "tones"
+    playback_volume = float(sys.argv[2]) if len(sys.argv) > 2 else 0.1
+    for name, (sone, phon) in analyse_directory(directory, playback_volume).items():
+        print(f"{name:15s} {sone:8.2f} sone {phon:7.1f} phon")
@@ -0,0 +1,149 @@
+"""
+Block-based streaming noise for continuous maskers.
+
+NoiseGenerator draws Gaussian white noise from a seeded generator and, for
+coloured or band-limited noise, shapes it with a linear-phase FIR in a
+FIRStream. The overlap-add state carries across blocks, so the stream has no
+loop points or seams however long the session runs. Memory is bounded by one
+block plus the filter tail.
+
+Colours (power spectral density):
+    white   flat
+    pink    1 / f (-3 dB per octave)
+    brown   1 / f ** 2 (-6 dB per octave)
+A band=(low, high) limit can be applied to any colour. The spectral slope is
+held constant below SLOPE_FLOOR Hz so the gain stays finite near DC.
+"""
+
+import sys
+import time
+from functools import lru_cache
+
+import numpy as np
+
+from loudness_compensation_filter import FIRStream, frequency_sampling_fir
+
+COLOR_EXPONENTS = {"white": 0.0, "pink": 1.0, "brown": 2.0}
+SLOPE_FLOOR = 20.0
+
+
+@lru_cache(maxsize=16)
+def design_noise_filter(color, fs, numtaps=4097, band=None):
+    """
+    Linear-phase FIR (read-only) that turns unit white noise into unit-RMS noise of a colour.
+
+    Parameters:
+    color : str
+        "white", "pink" or "brown".
+    fs : int
+        Sample rate in Hz.
+    numtaps : int, optional
+        Filter length; longer filters follow the slope to lower frequencies.
+    band : tuple of float, optional
+        (low, high) pass band in Hz.
+    """
+    assert color in COLOR_EXPONENTS, f"Unknown noise colour: {color}"
+
+    def magnitude(freqs):
+        gain = np.maximum(freqs, SLOPE_FLOOR) ** (-COLOR_EXPONENTS[color] / 2)
+        if band is not None:
+            low, high = band
+            gain[(freqs < low) | (freqs > high)] = 0
+        return gain
+
+    h = frequency_sampling_fir(magnitude, fs, numtaps, beta=8.0)
+    # White noise through h has variance sum(h ** 2)
+    h /= np.sqrt(np.sum(h**2))
+    h.setflags(write=False)
+    return h
+
+
+class NoiseGenerator:
+    """
+    Endless noise in fixed-size float32 blocks.
+
+    Parameters:
+    color : str, optional
+        "white" (default), "pink" or "brown".
+    fs : int, optional
+        Sample rate in Hz.
+    block_size : int, optional
+        Samples per block.
+    rms : float, optional
+        RMS level of the output (full scale = 1).
+    band : tuple of float, optional
+        (low, high) pass band in Hz.
+    seed : int, optional
+        Seed of the random generator; equal seeds give identical streams.
+    channels : int, optional
+        Independent noise channels; blocks are (block_size, channels) when > 1.
+    numtaps : int, optional
+        Length of the shaping filter.
+    """
+
+    def __init__(
+        self,
+        color="white",
+        fs=48000,
+        block_size=1024,
+        rms=0.1,
+        band=None,
+        seed=None,
+        channels=1,
+        numtaps=4097,
+    ):
+        self.color = color
+        self.fs = fs
+        self.block_size = block_size
+        self.rms = rms
+        self.channels = channels
+        self._shape = (block_size,) if channels == 1 else (block_size, channels)
+        self._rng = np.random.default_rng(seed)
+        self._noise = np.empty(self._shape, dtype=np.float32)
+
+        self._stream = None
+        if color != "white" or band is not None:
+            band = None if band is None else tuple(band)
+            self._stream = FIRStream(design_noise_filter(color, fs, numtaps, band))
+            # Fill the filter state, so the first block is already stationary
+            for _ in range(-(-numtaps // block_size)):
+                self._stream.process(self._draw())
+
+    def _draw(self):
+        return self._rng.standard_normal(self._shape, dtype=np.float32, out=self._noise)
+
+    def next_block(self, out=None):
+        """The next block of the stream, written into out= (float32, block shape) when given."""
+        if out is None:
+            out = np.empty(self._shape, dtype=np.float32)
+        block = self._draw()
+        if self._stream is not None:
+            block = self._stream.process(block)
+        np.multiply(block, self.rms, out=out, casting="same_kind")
+        return out
+
+    def __iter__(self):
+        while True:
+            yield self.next_block()
+
+    def generate(self, n_samples):
+        """n_samples of the stream in one array (whole blocks are drawn)."""
+        n_blocks = -(-n_samples // self.block_size)
+        out = np.empty((n_blocks * self.block_size,) + self._shape[1:], np.float32)
+        for i in range(n_blocks):
+            start = i * self.block_size
+            self.next_block(out=out[start : start + self.block_size])
+        return out[:n_samples]
+
+
+if __name__ == "__main__":
+    noise_color = sys.argv[1] if len(sys.argv) > 1 else "pink"
+    generator = NoiseGenerator(noise_color, seed=0)
+    block = np.empty(generator.block_size, dtype=np.float32)
+    n_blocks = 2000
+    start_time = time.perf_counter()
+    for _ in range(n_blocks):
+        generator.next_block(out=block)
+    elapsed = time.perf_counter() - start_time
+    audio_seconds = n_blocks * generator.block_size / generator.fs
+    print(f"{noise_color}: {audio_seconds / elapsed:.0f}x real time")
@@ -0,0 +1,308 @@
+"""
+One always-open output stream with a software mixer.
+
+Instead of a sound stream per play, the device stream is opened once and its
+callback pulls every block from a Mixer. Playing a sound only adds a voice
+(a buffer, a playhead and a gain) to the mixer's voice list, so there is no
+stream start-up latency and no buffer setup per play, and overlapping
+sounds (reference and target) are summed rather than fighting over the
+device.
+
+Every voice fades in from 0 over ramp_ms, and gain changes and stops ramp
+linearly over the same time, so onsets (e.g. a noise segment that starts
+mid-waveform), changes and stops are click-free. At most max_voices voices
+sound at once; a new voice beyond that steals the oldest one, which is faded
+out over the same ramp.
+
+render runs in the audio callback and does no array allocation: ramps and
+scaled chunks are written into scratch buffers sized on the first block.
+
+Commands (play, set_gain, stop) are queued by the calling thread and
+applied by the audio thread at the start of the next block, so the
+callback never waits on a lock.
+
+Outputs:
+    DeviceOutput      sounddevice callback stream (needs sounddevice)
+    FileSinkOutput    renders the same blocks into memory / a WAV file, either
+                      on demand (advance) or paced in real time (start)
+"""
+
+import itertools
+import sys
+import threading
+import time
+from collections import deque
+
+import numpy as np
+
+from wav_io import write_wav
+
+
+class _Voice:
+    __slots__ = ("id", "buffer", "position", "gain", "target", "step", "ramp_left")
+
+    def __init__(self, voice_id, buffer, gain):
+        self.id = voice_id
+        self.buffer = buffer
+        self.position = 0
+        self.gain = gain
+        self.target = gain
+        self.step = 0.0
+        self.ramp_left = 0
+
+
+class Mixer:
+    """
+    Sums voices into output blocks.
+
+    Parameters:
+    fs : int, optional
+        Sample rate in Hz.
+    channels : int, optional
+        Output channels; mono voices are sent to every channel.
+    max_voices : int, optional
+        Voices sounding at once before the oldest is stolen.
+    ramp_ms : float, optional
+        Duration of gain ramps, fade-outs and steals.
+    """
+
+    def __init__(self, fs=48000, channels=1, max_voices=8, ramp_ms=5.0):
+        assert max_voices >= 1, "The mixer needs at least one voice."
+        self.fs = fs
+        self.channels = channels
+        self.max_voices = max_voices
+        self.ramp_samples = max(1, int(round(ramp_ms * fs / 1000)))
+        self.voices = []
+        self._commands = deque()
+        self._ids = itertools.count(1)
+        self._ramp_index = np.arange(1, self.ramp_samples + 1, dtype=np.float32)
+        self._gains = np.empty((0, 1), dtype=np.float32)
+        self._scaled = np.empty((0, channels), dtype=np.float32)
+        self.steals = 0
+
+    def play(self, buffer, gain=1.0):
+        """
+        Queue a buffer for playback from the next block on.
+
+        Parameters:
+        buffer : array-like
+            float samples at fs, shape (n,) or (n, channels).
+        gain : float, optional
+            Linear gain (the PsychoPy volume).
+
+        Returns:
+        int
+            Voice id for set_gain and stop.
+        """
+        buffer = np.asarray(buffer, dtype=np.float32)
+        if buffer.ndim == 1:
+            buffer = buffer[:, np.newaxis]
+        assert buffer.shape[1] in (1, self.channels), "Buffer channel count mismatch."
+        voice_id = next(self._ids)
+        self._commands.append(("play", voice_id, buffer, float(gain)))
+        return voice_id
+
+    def set_gain(self, voice_id, gain):
+        """Ramp a voice to a new gain (a voice ramped to 0 is released)."""
+        self._commands.append(("gain", voice_id, float(gain)))
+
+    def stop(self, voice_id=None):
+        """Fade out one voice, or all voices when voice_id is None."""
+        self._commands.append(("stop", voice_id))
+
+    def voice_output(self, buffer, gain=1.0):
+        """What a lone voice of buffer at gain adds to the output, fade-in included."""
+        output = np.asarray(buffer, dtype=np.float32) * np.float32(gain)
+        r = min(self.ramp_samples, len(output))
+        fade = self._ramp_index[:r] / self.ramp_samples
+        output[:r] *= fade.reshape((r,) + (1,) * (output.ndim - 1))
+        return output
+
+    @property
+    def active(self):
+        """Number of voices still sounding (including fading ones)."""
+        return len(self.voices)
+
+    def _ramp_to(self, voice, target):
+        voice.target = target
+        voice.ramp_left = self.ramp_samples
+        voice.step = (target - voice.gain) / self.ramp_samples
+
+    def _apply_commands(self):
+        while self._commands:
+            command = self._commands.popleft()
+            if command[0] == "play":
+                _, voice_id, buffer, gain = command
+                sounding = [voice for voice in self.voices if voice.target > 0]
+                if len(sounding) >= self.max_voices:
+                    self._ramp_to(sounding[0], 0.0)
+                    self.steals += 1
+                voice = _Voice(voice_id, buffer, 0.0)
+                self._ramp_to(voice, gain)
+                self.voices.append(voice)
+            else:
+                voice_id = command[1]
+                for voice in self.voices:
+                    if voice_id is None or voice.id == voice_id:
+                        self._ramp_to(
+                            voice, 0.0 if command[0] == "stop" else command[2]
+                        )
+
+    def render(self, out):
+        """Fill out (float32, shape (frames, channels)) with the next block; the stream callback."""
+        self._apply_commands()
+        out.fill(0)
+        n = len(out)
+        if len(self._gains) < n:
+            self._gains = np.empty((n, 1), dtype=np.float32)
+            self._scaled = np.empty((n, self.channels), dtype=np.float32)
+
+        finished = []
+        for voice in self.voices:
+            chunk = voice.buffer[voice.position : voice.position + n]
+            k = len(chunk)
+            scaled = self._scaled[:k, : chunk.shape[1]]
+            if voice.ramp_left and k:
+                # Linear ramp for the first r samples, then the target gain
+                r = min(voice.ramp_left, k)
+                gains = self._gains[:k]
+                np.multiply(self._ramp_index[:r], voice.step, out=gains[:r, 0])
+                gains[:r, 0] += voice.gain
+                gains[r:, 0] = voice.target
+                np.multiply(chunk, gains, out=scaled)
+                out[:k] += scaled
+                voice.ramp_left -= r
+                voice.gain = float(gains[r - 1, 0]) if voice.ramp_left else voice.target
+            elif voice.gain:
+                np.multiply(chunk, np.float32(voice.gain), out=scaled)
+                out[:k] += scaled
+            voice.position += k
+            if voice.position >= len(voice.buffer) or (
+                voice.target == 0 and not voice.ramp_left
+            ):
+                finished.append(voice)
+        for voice in finished:
+            self.voices.remove(voice)
+        return out
+
+
+class DeviceOutput:
+    """
+    Continuously running sounddevice stream whose callback renders the mixer.
+
+    Parameters:
+    mixer : Mixer
+        Source of every block.
+    device : int or str, optional
+        sounddevice output device.
+    block_size : int, optional
+        Frames per callback.
+    """
+
+    def __init__(self, mixer, device=None, block_size=256):
+        import sounddevice
+
+        self.mixer = mixer
+        self.underruns = 0
+        self._stream = sounddevice.OutputStream(
+            samplerate=mixer.fs,
+            blocksize=block_size,
+            device=device,
+            channels=mixer.channels,
+            dtype="float32",
+            latency="low",
+            callback=self._callback,
+        )
+        self._stream.start()
+
+    def _callback(self, outdata, frames, time_info, status):
+        if status.output_underflow:
+            self.underruns += 1
+        self.mixer.render(outdata)
+
+    def close(self):
+        self._stream.stop()
+        self._stream.close()
+
+
+class FileSinkOutput:
+    """
+    Renders the mixer block by block into memory instead of a device.
+
+    advance(frames) renders on demand (offline tests); start() renders one
+    block per block duration on a background thread, like a device callback.
+
+    Parameters:
+    mixer : Mixer
+        Source of every block.
+    path : str, optional
+        WAV file written on close.
+    block_size : int, optional
+        Frames per block.
+    """
+
+    def __init__(self, mixer, path=None, block_size=256):
+        self.mixer = mixer
+        self.path = path
+        self.block_size = block_size
+        self.blocks = []
+        self._thread = None
+        self._running = False
+
+    @property
+    def frames(self):
+        """Frames rendered so far."""
+        return len(self.blocks) * self.block_size
+
+    def advance(self, frames):
+        """Render whole blocks until at least frames more frames are written."""
+        for _ in range(-(-frames // self.block_size)):
+            block = np.empty((self.block_size, self.mixer.channels), dtype=np.float32)
+            self.blocks.append(self.mixer.render(block))
+
+    def start(self):
+        """Render in real time on a background thread until close()."""
+        self._running = True
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+
+    def _run(self):
+        period = self.block_size / self.mixer.fs
+        next_time = time.perf_counter()
+        while self._running:
+            self.advance(self.block_size)
+            next_time += period
+            time.sleep(max(0.0, next_time - time.perf_counter()))
+
+    def samples(self):
+        """Everything rendered so far, shape (frames, channels)."""
+        if not self.blocks:
+            return np.zeros((0, self.mixer.channels), dtype=np.float32)
+        return np.concatenate(self.blocks)
+
+    def close(self):
+        self._running = False
+        if self._thread is not None:
+            self._thread.join()
+        if self.path:
+            samples = self.samples()
+            write_wav(
+                self.path,
+                samples[:, 0] if samples.shape[1] == 1 else samples,
+                self.mixer.fs,
+            )
+
+
+if __name__ == "__main__":
+    from tone_synth import tone_bank
+
+    path = sys.argv[1] if len(sys.argv) > 1 else "mixer_demo.wav"
+    tones = tone_bank()
+    mixer = Mixer(max_voices=4)
+    sink = FileSinkOutput(mixer, path)
+    for i in range(0, len(tones), 3):
+        mixer.play(tones[i], gain=0.2)
+        sink.advance(mixer.fs // 100)
+    sink.advance(mixer.fs // 10)
+    sink.close()
+    print(f"{sink.frames} frames, {mixer.steals} voices stolen, written to {path}")
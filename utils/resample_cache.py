@@ -0,0 +1,108 @@
+"""
+Load-time sample-rate unification for stimulus files.
+
+The audio device runs at one rate, but the stimulus set mixes 48 kHz tones
+with a 44.1 kHz noise. load_resampled reads each file's rate from its WAV
+header and converts it once to the device rate with a polyphase resampler
+(scipy.signal.resample_poly). The result is stored in a cache directory
+under the hash of the file contents and the target rate, so later sessions
+load the converted buffer directly, and an edited file is never served stale.
+Files already at the device rate are read as they are.
+"""
+
+import hashlib
+import os
+import sys
+import wave
+from fractions import Fraction
+
+import numpy as np
+
+from wav_io import read_wav
+
+CACHE_DIR = ".resample_cache"
+
+
+def wav_sample_rate(path):
+    """Sample rate of a WAV file, read from its header only."""
+    with wave.open(path, "rb") as wav_file:
+        return wav_file.getframerate()
+
+
+def resample(samples, fs_in, fs_out):
+    """Polyphase resampling along axis 0 (needs SciPy); returns float32."""
+    if fs_in == fs_out:
+        return np.asarray(samples, dtype=np.float32)
+    from scipy import signal
+
+    ratio = Fraction(int(fs_out), int(fs_in))
+    resampled = signal.resample_poly(
+        samples, ratio.numerator, ratio.denominator, axis=0
+    )
+    return resampled.astype(np.float32)
+
+
+def _cache_path(path, fs, cache_dir):
+    digest = hashlib.blake2b(digest_size=16)
+    with open(path, "rb") as wav_file:
+        for chunk in iter(lambda: wav_file.read(1 << 20), b""):
+            digest.update(chunk)
+    digest.update(str(int(fs)).encode())
+    return os.path.join(cache_dir, digest.hexdigest() + ".npy")
+
+
+def load_resampled(path, fs, cache_dir=None):
+    """
+    Samples of a WAV file at the sample rate fs, via the resample cache.
+
+    Parameters:
+    path : str
+        WAV file.
+    fs : int
+        Device sample rate in Hz.
+    cache_dir : str, optional
+        Cache directory (default: .resample_cache next to the file).
+
+    Returns:
+    numpy.ndarray
+        float32 samples in [-1, 1), shape (n,) or (n, channels).
+    """
+    if wav_sample_rate(path) == fs:
+        return read_wav(path)[0]
+
+    if cache_dir is None:
+        cache_dir = os.path.join(os.path.dirname(path), CACHE_DIR)
+    cached = _cache_path(path, fs, cache_dir)
+    if os.path.exists(cached):
+        return np.load(cached)
+
+    samples, fs_in = read_wav(path)
+    resampled = resample(samples, fs_in, fs)
+    os.makedirs(cache_dir, exist_ok=True)
+    # Write under a temporary name so a concurrent session never reads half a file
+    temporary = f"{cached}.{os.getpid()}.tmp"
+    with open(temporary, "wb") as cache_file:
+        np.save(cache_file, resampled)
+    os.replace(temporary, cached)
+    return resampled
+
+
+def load_stimulus_set(paths, fs, cache_dir=None):
+    """{name without extension: samples at fs} for a list of WAV files, e.g. as VolumeAdjuster's sound_buffers."""
+    return {
+        os.path.splitext(os.path.basename(path))[0]: load_resampled(path, fs, cache_dir)
+        for path in paths
+    }
+
+
+if __name__ == "__main__":
+    directory = sys.argv[1] if len(sys.argv) > 1 else "tones"
+    device_rate = int(sys.argv[2]) if len(sys.argv) > 2 else 48000
+    wav_paths = sorted(
+        os.path.join(directory, name)
+        for name in os.listdir(directory)
+        if name.lower().endswith(".wav")
+    )
+    stimuli = load_stimulus_set(wav_paths, device_rate)
+    for name, samples in stimuli.items():
+        print(f"{name:12s} {len(samples):8d} samples at {device_rate} Hz")
@@ -0,0 +1,117 @@
+"""
+Pooled PsychoPy playback for VolumeAdjuster (PTBBackend(use_pool=True)).
+
+Building a fresh sound.Sound from a file for every play avoids the ALSA
+volume decay described in vol_adjustment_slider_object_linux.py, but each
+repeat then pays for a file decode and a new stream. SoundPool decodes every
+stimulus once and keeps a few Sound objects ("slots") alive. Before each
+play the slot is explicitly stopped, rewound to the start and given the
+requested volume, so no state (playhead, volume, a track still draining)
+carries over from one play to the next.
+
+Slots are bound to stimuli least-recently-used first: replaying the same
+stimulus reuses its slot as it is, and only a switch of stimulus replaces a
+slot's buffer (setSound, no new stream).
+
+Whether reset, reused PTB Sounds are free of the ALSA volume decay has not
+been verified: benchmarks/sound_pool_repeat.py checks only the pool's own
+stop / rewind / volume logic, against mock Sounds, and cannot show the
+decay. The pool is therefore opt-in on Linux (PTBBackend(use_pool=True)).
+The Linux default is MixerBackend; PTBBackend without the pool builds a
+new Sound for every play.
+
+The Sound class comes from a factory, psychopy's sound.Sound by default.
+"""
+
+import os
+from collections import OrderedDict
+
+import numpy as np
+
+
+def decode_sound(value, sample_rate):
+    """float32 samples at sample_rate of a WAV file path (decoded once, resampled via the cache) or an array."""
+    if isinstance(value, (str, os.PathLike)):
+        from resample_cache import load_resampled
+
+        return load_resampled(os.fspath(value), sample_rate)
+    return np.asarray(value, dtype=np.float32)
+
+
+def psychopy_sound_factory(buffer, sample_rate, volume):
+    """Default slot factory: a PsychoPy (PTB) Sound playing buffer."""
+    from psychopy import sound
+
+    return sound.Sound(buffer, sampleRate=sample_rate, volume=volume)
+
+
+class SoundPool:
+    """
+    Preloaded stimuli played through a fixed number of reusable Sound slots.
+
+    Parameters:
+    sounds : dict
+        {name: samples array or WAV file path}. Files are decoded (and
+        resampled to sample_rate) once, here.
+    sample_rate : int, optional
+        Device sample rate in Hz.
+    n_slots : int, optional
+        Number of Sound objects kept alive.
+    sound_factory : callable, optional
+        factory(buffer, sample_rate, volume) -> Sound-like object with play,
+        stop, setVolume and setSound (seek is used when present).
+    """
+
+    def __init__(self, sounds, sample_rate=48000, n_slots=2, sound_factory=None):
+        assert n_slots >= 1, "The pool needs at least one slot."
+        self.sample_rate = sample_rate
+        self.n_slots = n_slots
+        self.sound_factory = sound_factory or psychopy_sound_factory
+        self.buffers = {
+            name: decode_sound(value, sample_rate) for name, value in sounds.items()
+        }
+        # name -> Sound, least recently played first
+        self._slots = OrderedDict()
+
+    def __contains__(self, name):
+        return name in self.buffers
+
+    def _slot(self, name, volume):
+        if name in self._slots:
+            self._slots.move_to_end(name)
+            return self._slots[name]
+        buffer = self.buffers[name]
+        if len(self._slots) < self.n_slots:
+            slot = self.sound_factory(buffer, self.sample_rate, volume)
+        else:
+            _, slot = self._slots.popitem(last=False)
+            slot.stop()
+            slot.setSound(buffer)
+        self._slots[name] = slot
+        return slot
+
+    def play(self, name, volume=1.0):
+        """Play a stimulus from its start at volume; returns the slot playing it."""
+        slot = self._slot(name, volume)
+        slot.stop()
+        seek = getattr(slot, "seek", None)
+        if seek is not None:
+            seek(0)
+        slot.setVolume(volume)
+        slot.play()
+        return slot
+
+    def preload(self, names=None):
+        """Bind slots to stimuli ahead of their first play (at most n_slots)."""
+        for name in list(self.buffers if names is None else names)[: self.n_slots]:
+            self._slot(name, 1.0)
+
+    def set_volume(self, name, volume):
+        """Change the volume of a stimulus's slot, e.g. while it plays."""
+        if name in self._slots:
+            self._slots[name].setVolume(volume)
+
+    def stop(self):
+        """Stop every slot."""
+        for slot in self._slots.values():
+            slot.stop()
@@ -0,0 +1,210 @@
+"""
+Single-file stimulus archive: one open and one mmap instead of a file per stimulus.
+
+pack_directory combines the WAV files of a stimulus directory and its metadata
+CSV into one file:
+
+    bytes 0-7      magic b"STIMARC1"
+    bytes 8-15     header length (uint64, little endian)
+    header         UTF-8 JSON: one index entry per stimulus (name, sample
+                   rate, channels, sample width, frames, data offset), the
+                   Filename and Frequency columns of the metadata and the
+                   original CSV text
+    PCM blocks     the raw PCM of each file, every block aligned to ALIGNMENT
+                   bytes from the start of the archive
+
+StimulusArchive maps the file once and returns per-stimulus NumPy views by
+name or by frequency. unpack restores the original directory layout (the
+WAV files and the CSV, byte-identical for files written by the wave module).
+"""
+
+import json
+import os
+import struct
+import sys
+import wave
+
+import numpy as np
+
+from stimulus_catalogue import nearest_index
+from stimulus_table import read_tones_metadata
+from wav_io import PCM_DTYPES
+
+MAGIC = b"STIMARC1"
+ALIGNMENT = 4096
+
+
+def _align(offset):
+    return -(-offset // ALIGNMENT) * ALIGNMENT
+
+
+def pack_directory(directory, archive_path, metadata_name="tones_metadata.csv"):
+    """
+    Pack the WAV files and metadata CSV of a directory into one archive.
+
+    Files listed in the CSV (read_tones_metadata: columns Filename,Frequency)
+    come first, in CSV order, followed by the other WAV files in name order.
+    The frequencies become the frequency index of the archive; files without
+    a row get NaN. The CSV text is stored as-is for unpack.
+
+    Returns:
+    int
+        Number of packed stimuli.
+    """
+    metadata_path = os.path.join(directory, metadata_name)
+    metadata_text = ""
+    listed, listed_frequencies = [], []
+    if os.path.exists(metadata_path):
+        with open(metadata_path, newline="") as csv_file:
+            metadata_text = csv_file.read()
+        listed, listed_frequencies = read_tones_metadata(metadata_path)
+    others = sorted(
+        name
+        for name in os.listdir(directory)
+        if name.lower().endswith(".wav") and name not in listed
+    )
+    frequencies = dict(zip(listed, listed_frequencies))
+
+    entries = []
+    blocks = []
+    for filename in listed + others:
+        with wave.open(os.path.join(directory, filename), "rb") as wav_file:
+            width = wav_file.getsampwidth()
+            assert width in PCM_DTYPES, f"Unsupported sample width in {filename}."
+            pcm = wav_file.readframes(wav_file.getnframes())
+            entries.append(
+                {
+                    "filename": filename,
+                    "fs": wav_file.getframerate(),
+                    "channels": wav_file.getnchannels(),
+                    "width": width,
+                    "frames": wav_file.getnframes(),
+                    "frequency": frequencies.get(filename, float("nan")),
+                }
+            )
+        blocks.append(pcm)
+
+    header = {
+        "metadata_name": metadata_name if metadata_text else None,
+        "metadata_text": metadata_text,
+        "columns": {"Filename": listed, "Frequency": list(listed_frequencies)},
+        "entries": entries,
+    }
+    # Offsets depend on the header length, which depends on the offsets; reserve
+    # the width of the largest possible offset first
+    for entry in entries:
+        entry["offset"] = 10**15
+    header_length = len(json.dumps(header).encode())
+    offset = _align(16 + header_length)
+    for entry, block in zip(entries, blocks):
+        entry["offset"] = offset
+        offset = _align(offset + len(block))
+    header_bytes = json.dumps(header).encode().ljust(header_length)
+
+    with open(archive_path, "wb") as archive:
+        archive.write(MAGIC + struct.pack("<Q", len(header_bytes)) + header_bytes)
+        for entry, block in zip(entries, blocks):
+            archive.seek(entry["offset"])
+            archive.write(block)
+        archive.truncate(offset)
+    return len(entries)
+
+
+class StimulusArchive:
+    """
+    Read-only access to an archive written by pack_directory.
+
+    Views are returned by file name ("tone_3.wav"), by name without extension
+    ("tone_3") or by frequency (nearest listed frequency).
+
+    Parameters:
+    path : str
+        Archive file.
+    """
+
+    def __init__(self, path):
+        self._data = np.memmap(path, dtype=np.uint8, mode="r")
+        assert bytes(self._data[:8]) == MAGIC, f"Not a stimulus archive: {path}"
+        (header_length,) = struct.unpack("<Q", bytes(self._data[8:16]))
+        self.header = json.loads(bytes(self._data[16 : 16 + header_length]))
+        self.entries = self.header["entries"]
+        self.columns = self.header["columns"]
+
+        self._index = {}
+        for position, entry in enumerate(self.entries):
+            self._index[entry["filename"]] = position
+            self._index[os.path.splitext(entry["filename"])[0]] = position
+        self.frequencies = np.array([entry["frequency"] for entry in self.entries])
+        listed = np.flatnonzero(~np.isnan(self.frequencies))
+        order = np.argsort(self.frequencies[listed])
+        self._sorted_frequencies = self.frequencies[listed][order]
+        self._by_frequency = listed[order]
+
+    def __len__(self):
+        return len(self.entries)
+
+    def __contains__(self, name):
+        return name in self._index
+
+    @property
+    def names(self):
+        return [entry["filename"] for entry in self.entries]
+
+    def entry(self, name):
+        """Index entry (sample rate, channels, frames, ...) of a stimulus."""
+        return self.entries[self._index[name]]
+
+    def _view(self, position):
+        entry = self.entries[position]
+        n_bytes = entry["frames"] * entry["channels"] * entry["width"]
+        pcm = self._data[entry["offset"] : entry["offset"] + n_bytes].view(
+            PCM_DTYPES[entry["width"]]
+        )
+        return pcm if entry["channels"] == 1 else pcm.reshape(-1, entry["channels"])
+
+    def pcm(self, name):
+        """Raw PCM of a stimulus, a zero-copy view of the mapped archive."""
+        return self._view(self._index[name])
+
+    def samples(self, name, out=None, dtype=np.float32):
+        """Samples of a stimulus as floats in [-1, 1), written into out= when given."""
+        position = self._index[name]
+        pcm = self._view(position)
+        if out is None:
+            out = np.empty(pcm.shape, dtype=dtype)
+        scale = 1 / 2 ** (8 * self.entries[position]["width"] - 1)
+        return np.multiply(pcm, scale, out=out, casting="unsafe")
+
+    def nearest(self, frequency):
+        """File name of the stimulus whose listed frequency is closest to frequency."""
+        listed = self._sorted_frequencies
+        assert len(listed), "The archive lists no frequencies."
+        position = self._by_frequency[nearest_index(listed, frequency)]
+        return self.entries[position]["filename"]
+
+    def pcm_at(self, frequency):
+        """Raw PCM view of the stimulus nearest to frequency."""
+        return self.pcm(self.nearest(frequency))
+
+    def unpack(self, directory):
+        """Write the WAV files and the metadata CSV back in the original layout."""
+        os.makedirs(directory, exist_ok=True)
+        for position, entry in enumerate(self.entries):
+            with wave.open(
+                os.path.join(directory, entry["filename"]), "wb"
+            ) as wav_file:
+                wav_file.setnchannels(entry["channels"])
+                wav_file.setsampwidth(entry["width"])
+                wav_file.setframerate(entry["fs"])
+                wav_file.writeframes(self._view(position).tobytes())
+        if self.header["metadata_name"]:
+            with open(
+                os.path.join(directory, self.header["metadata_name"]), "w", newline=""
+            ) as csv_file:
+                csv_file.write(self.header["metadata_text"])
+
+
+if __name__ == "__main__":
+    source = sys.argv[1] if len(sys.argv) > 1 else "tones"
+    target = sys.argv[2] if len(sys.argv) > 2 else "tones.stimarc"
+    print(f"Packed {pack_directory(source, target)} stimuli into {target}")
@@ -0,0 +1,132 @@
+"""
+Loudness-equalized stimulus bank with the gains baked into the samples.
+
+StimulusBank keeps the unscaled stimuli and one contiguous float32 array with
+row i = stimulus i * gain i. The gains are normalize_loudness_direct volumes
+at the target phon level, optionally with a dB offset. The playback path takes
+zero-copy row views and plays them at full volume, so it never computes
+gains. set_phon recomputes the gains with a ContourEvaluator and rescales the
+whole bank with one multiply into the existing array.
+"""
+
+import os
+import sys
+
+import numpy as np
+
+from equal_loudness_contor_2023ISO_params import ContourEvaluator
+
+
+class StimulusBank:
+    """
+    Stimuli scaled to equal loudness at one phon level.
+
+    Parameters:
+    buffers : array-like or list of array-like
+        Mono stimuli in [-1, 1], a 2-D array (one row per stimulus) or a list of
+        1-D arrays; shorter stimuli are zero-padded in the bank.
+    frequencies : array-like
+        Frequency of each stimulus in Hz, used for its contour gain.
+    phon : float
+        Target loudness level.
+    offset_db : float or array-like, optional
+        Extra gain in dB, for all stimuli or one value per stimulus.
+    names : list of str, optional
+        Stimulus names for lookup by name (default "0", "1", ...).
+    fs : int, optional
+        Sample rate of the buffers in Hz.
+    a, b, standard, mirror, calibration :
+        As in normalize_loudness_direct.
+    """
+
+    def __init__(
+        self,
+        buffers,
+        frequencies,
+        phon,
+        offset_db=0.0,
+        names=None,
+        fs=48000,
+        a=0.34,
+        b=111.8,
+        standard="2023",
+        mirror=0,
+        calibration=None,
+    ):
+        buffers = [np.asarray(buffer, dtype=np.float32) for buffer in buffers]
+        self.lengths = np.array([len(buffer) for buffer in buffers])
+        self._source = np.zeros((len(buffers), self.lengths.max()), dtype=np.float32)
+        for row, buffer in enumerate(buffers):
+            self._source[row, : len(buffer)] = buffer
+        self._source.setflags(write=False)
+        self._peaks = np.abs(self._source).max(axis=1)
+
+        self.frequencies = np.asarray(frequencies, dtype=float).ravel()
+        assert len(self.frequencies) == len(buffers), "One frequency per stimulus."
+        self.names = [str(i) for i in range(len(buffers))] if names is None else names
+        self._rows = {name: row for row, name in enumerate(self.names)}
+        self.fs = fs
+
+        self._evaluator = ContourEvaluator(
+            self.frequencies,
+            mirror=mirror,
+            standard=standard,
+            a=a,
+            b=b,
+            calibration=calibration,
+            dtype=np.float32,
+        )
+        self.gains = np.empty(len(buffers), dtype=np.float32)
+        self.samples = np.empty_like(self._source)
+        self.phon = None
+        self.offset_db = offset_db
+        self.set_phon(phon, offset_db)
+
+    @classmethod
+    def from_metadata(
+        cls, phon, metadata_path="tones/tones_metadata.csv", offset_db=0.0, **kwargs
+    ):
+        """Bank of the synthesized tones listed in a metadata CSV, named like VolumeAdjuster's sounds."""
+        from tone_synth import SAMPLE_RATE, tone_bank_from_metadata
+
+        filenames, frequencies, tones = tone_bank_from_metadata(metadata_path)
+        names = [os.path.splitext(filename)[0] for filename in filenames]
+        kwargs.setdefault("fs", SAMPLE_RATE)
+        return cls(tones, frequencies, phon, offset_db, names, **kwargs)
+
+    def set_phon(self, phon, offset_db=None):
+        """Rescale every stimulus to a new phon level (and optionally a new offset) in place."""
+        if offset_db is not None:
+            self.offset_db = offset_db
+        self._evaluator.volumes(phon, out=self.gains)
+        self.gains *= np.float32(10) ** (
+            np.asarray(self.offset_db, dtype=np.float32) / 20
+        )
+        np.multiply(self._source, self.gains[:, np.newaxis], out=self.samples)
+        self.phon = phon
+
+        clipped = self.gains * self._peaks > 1
+        if np.any(clipped):
+            print(
+                f"Warning: {np.count_nonzero(clipped)} stimuli exceed full scale at "
+                f"{phon} phon and will clip."
+            )
+
+    def __len__(self):
+        return len(self.names)
+
+    def __getitem__(self, key):
+        """Zero-copy view of one scaled stimulus, by name or index."""
+        row = self._rows[key] if isinstance(key, str) else key
+        return self.samples[row, : self.lengths[row]]
+
+    def buffers(self):
+        """{name: view} for all stimuli, e.g. as VolumeAdjuster's sound_buffers."""
+        return {name: self[row] for row, name in enumerate(self.names)}
+
+
+if __name__ == "__main__":
+    target_phon = float(sys.argv[1]) if len(sys.argv) > 1 else 60.0
+    bank = StimulusBank.from_metadata(target_phon)
+    for name, gain in zip(bank.names, bank.gains):
+        print(f"{name:10s} gain {gain:.4f} peak {np.abs(bank[name]).max():.4f}")
@@ -0,0 +1,134 @@
+"""
+Indexed catalogue of the stimuli listed in a metadata CSV.
+
+StimulusCatalogue keeps one NumPy column per property (file name, frequency,
+duration, sample rate, level), sorted by frequency. Nearest-frequency,
+frequency-range and octave-band queries are binary searches
+(np.searchsorted). Ranges come back as catalogues whose columns are slices
+of the parent's, so selecting a subset is O(log n) however large the
+catalogue is. sound_files and directory are exactly the arguments
+VolumeAdjuster takes (see VolumeAdjuster.from_catalogue).
+
+Duration and sample rate come from the WAV headers. Level is the RMS of the
+file in dB re full scale, from the memory-mapped samples.
+"""
+
+import os
+import sys
+
+import numpy as np
+
+from stimulus_table import read_tones_metadata
+from wav_io import MappedWav
+
+COLUMNS = ("filename", "frequency", "duration", "sample_rate", "level")
+
+
+def nearest_index(sorted_values, value):
+    """Index of the entry of an ascending array closest to value (the lower one on a tie)."""
+    assert len(sorted_values), "No values to search."
+    i = int(np.searchsorted(sorted_values, value))
+    if i == len(sorted_values) or (
+        i > 0 and value - sorted_values[i - 1] <= sorted_values[i] - value
+    ):
+        i -= 1
+    return i
+
+
+class StimulusCatalogue:
+    """
+    Stimulus properties as frequency-sorted columns.
+
+    Parameters:
+    columns : dict
+        Arrays of equal length keyed by COLUMNS.
+    directory : str, optional
+        Directory the file names are relative to.
+    """
+
+    def __init__(self, columns, directory=""):
+        order = np.argsort(columns["frequency"], kind="stable")
+        if np.all(order == np.arange(len(order))):
+            self.columns = {key: np.asarray(columns[key]) for key in COLUMNS}
+        else:
+            self.columns = {key: np.asarray(columns[key])[order] for key in COLUMNS}
+        self.directory = directory
+
+    @classmethod
+    def from_directory(cls, directory="tones", metadata_name="tones_metadata.csv"):
+        """Catalogue of the files listed in directory/metadata_name (columns Filename,Frequency)."""
+        filenames, frequencies = read_tones_metadata(
+            os.path.join(directory, metadata_name)
+        )
+
+        columns = {key: [] for key in COLUMNS}
+        for filename, frequency in zip(filenames, frequencies):
+            wav = MappedWav(os.path.join(directory, filename))
+            rms = np.sqrt(np.mean(wav.segment_float(0, len(wav), dtype=float) ** 2))
+            columns["filename"].append(filename)
+            columns["frequency"].append(frequency)
+            columns["duration"].append(wav.duration)
+            columns["sample_rate"].append(wav.fs)
+            with np.errstate(divide="ignore"):
+                columns["level"].append(20 * np.log10(rms))
+        columns["filename"] = np.array(columns["filename"], dtype=object)
+        return cls(
+            {key: np.array(values) for key, values in columns.items()}, directory
+        )
+
+    def __len__(self):
+        return len(self.columns["frequency"])
+
+    def __getattr__(self, name):
+        # Columns as attributes: catalogue.frequency, catalogue.level, ...
+        if name in COLUMNS:
+            return self.columns[name]
+        raise AttributeError(name)
+
+    @property
+    def sound_files(self):
+        """File names, in frequency order, for VolumeAdjuster's sound_files."""
+        return list(self.columns["filename"])
+
+    def _slice(self, start, stop):
+        subset = StimulusCatalogue.__new__(StimulusCatalogue)
+        subset.columns = {
+            key: column[start:stop] for key, column in self.columns.items()
+        }
+        subset.directory = self.directory
+        return subset
+
+    def nearest(self, frequency):
+        """Position of the stimulus whose frequency is closest to frequency."""
+        assert len(self), "The catalogue is empty."
+        return nearest_index(self.columns["frequency"], frequency)
+
+    def nearest_filename(self, frequency):
+        return self.columns["filename"][self.nearest(frequency)]
+
+    def in_range(self, f_low, f_high):
+        """Sub-catalogue of the stimuli with f_low <= frequency <= f_high (a view)."""
+        frequencies = self.columns["frequency"]
+        start = np.searchsorted(frequencies, f_low, side="left")
+        stop = np.searchsorted(frequencies, f_high, side="right")
+        return self._slice(start, stop)
+
+    def octave_band(self, center, fraction=1):
+        """Sub-catalogue of the 1/fraction-octave band around center."""
+        half_width = 2 ** (1 / (2 * fraction))
+        return self.in_range(center / half_width, center * half_width)
+
+    def where(self, mask):
+        """Sub-catalogue of the stimuli where a boolean mask over the columns is true (a copy)."""
+        return StimulusCatalogue(
+            {key: column[mask] for key, column in self.columns.items()}, self.directory
+        )
+
+
+if __name__ == "__main__":
+    catalogue = StimulusCatalogue.from_directory(*sys.argv[1:2])
+    print(
+        f"{len(catalogue)} stimuli, {catalogue.frequency[0]:.0f}-{catalogue.frequency[-1]:.0f} Hz"
+    )
+    print("Nearest to 1 kHz:", catalogue.nearest_filename(1000))
+    print("Octave band at 1 kHz:", catalogue.octave_band(1000).sound_files)
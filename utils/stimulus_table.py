@@ -0,0 +1,215 @@
+"""
+Per-stimulus contour table built from a tone metadata file.
+
+tones/tones_metadata.csv lists each tone file with its exact frequency.
+load_stimulus_table evaluates iso226 and normalize_loudness_direct once for
+every tone at every phon level and saves the result next to the CSV. On later
+runs the cache file is loaded as long as its key still matches the
+CSV contents, the phon levels, the calibration and the contour settings.
+Otherwise the table is rebuilt.
+
+StimulusTable answers per-file queries with a dictionary lookup, so the trial
+loop gets model volumes in O(1) without touching the contour code.
+"""
+
+import csv
+import hashlib
+import os
+import sys
+
+import numpy as np
+
+from equal_loudness_contor_2023ISO_params import iso226, normalize_loudness_direct
+
+# Default phon levels: 0-100 phon in 1 phon steps
+PHON_LEVELS = np.arange(0.0, 101.0)
+# Part of the cache key; bump when the contour formula or calibration changes
+CACHE_VERSION = 4
+
+
+def read_tones_metadata(path):
+    """File names and frequencies (Hz) from a CSV with columns Filename,Frequency."""
+    with open(path, newline="") as csv_file:
+        rows = list(csv.DictReader(csv_file))
+    return [row["Filename"] for row in rows], np.array(
+        [float(row["Frequency"]) for row in rows]
+    )
+
+
+class StimulusTable:
+    """
+    SPL and model volume of each stimulus file at a set of phon levels.
+
+    Files can be looked up by file name ("tone_3.wav") or by the name without
+    extension ("tone_3"), which is how VolumeAdjuster keys its sounds.
+
+    Parameters:
+    filenames : list of str
+        Stimulus file names, one per row.
+    frequencies : numpy.ndarray
+        Frequency of each file in Hz.
+    phon : numpy.ndarray
+        Phon levels, one per column (ascending).
+    spl : numpy.ndarray
+        dB SPL, shape (n_files, n_phon).
+    volume : numpy.ndarray
+        normalize_loudness_direct volumes, shape (n_files, n_phon).
+    """
+
+    def __init__(self, filenames, frequencies, phon, spl, volume):
+        self.filenames = list(filenames)
+        self.frequencies = np.asarray(frequencies, dtype=float)
+        self.phon = np.asarray(phon, dtype=float)
+        self.spl_table = np.asarray(spl, dtype=float)
+        self.volume_table = np.asarray(volume, dtype=float)
+        for array in (self.frequencies, self.phon, self.spl_table, self.volume_table):
+            array.setflags(write=False)
+
+        self._rows = {}
+        for row, filename in enumerate(self.filenames):
+            self._rows[filename] = row
+            self._rows[os.path.splitext(filename)[0]] = row
+        self._columns = {level: column for column, level in enumerate(self.phon)}
+        # volume = gain * 10 ** (spl / 20) per file, for phon levels between columns
+        with np.errstate(invalid="ignore"):
+            self._gains = np.nanmean(self.volume_table / 10 ** (self.spl_table / 20), 1)
+
+    def __contains__(self, name):
+        return name in self._rows
+
+    def __len__(self):
+        return len(self.filenames)
+
+    def frequency(self, name):
+        """Frequency (Hz) of a stimulus file."""
+        return self.frequencies[self._rows[name]]
+
+    def spl(self, name, phon):
+        """dB SPL of a stimulus file at a phon level (linear in phon between table levels)."""
+        row = self._rows[name]
+        column = self._columns.get(float(phon))
+        if column is not None:
+            return self.spl_table[row, column]
+        return np.interp(phon, self.phon, self.spl_table[row])
+
+    def volume(self, name, phon):
+        """Model volume of a stimulus file at a phon level."""
+        row = self._rows[name]
+        column = self._columns.get(float(phon))
+        if column is not None:
+            return self.volume_table[row, column]
+        return self._gains[row] * 10 ** (self.spl(name, phon) / 20)
+
+    def save(self, path, key=""):
+        np.savez(
+            path,
+            filenames=np.array(self.filenames),
+            frequencies=self.frequencies,
+            phon=self.phon,
+            spl=self.spl_table,
+            volume=self.volume_table,
+            key=np.array(key),
+        )
+
+    @classmethod
+    def load(cls, path):
+        """Load a saved table; returns (table, key)."""
+        with np.load(path) as data:
+            table = cls(
+                data["filenames"].tolist(),
+                data["frequencies"],
+                data["phon"],
+                data["spl"],
+                data["volume"],
+            )
+            return table, str(data["key"])
+
+
+def build_stimulus_table(
+    metadata_path,
+    phon_levels=PHON_LEVELS,
+    a=0.34,
+    b=111.8,
+    standard="2023",
+    mirror=0,
+    calibration=None,
+):
+    """Evaluate iso226 and normalize_loudness_direct for every file in metadata_path."""
+
+    filenames, frequencies = read_tones_metadata(metadata_path)
+    phon = np.asarray(phon_levels, dtype=float)
+    spl, _, _ = iso226(phon, frequencies, mirror=mirror, standard=standard)
+    volume, _ = normalize_loudness_direct(
+        phon,
+        frequencies,
+        a=a,
+        b=b,
+        standard=standard,
+        mirror=mirror,
+        calibration=calibration,
+    )
+    return StimulusTable(filenames, frequencies, phon, spl, volume)
+
+
+def _table_key(metadata_path, phon_levels, a, b, standard, mirror, calibration):
+    # Changes to any input of build_stimulus_table change the key
+    digest = hashlib.blake2b(digest_size=16)
+    with open(metadata_path, "rb") as csv_file:
+        digest.update(csv_file.read())
+    digest.update(np.asarray(phon_levels, dtype=float).tobytes())
+    digest.update(repr((a, b, standard, mirror, CACHE_VERSION)).encode())
+    digest.update(calibration.cache_key().encode() if calibration else b"flat")
+    return digest.hexdigest()
+
+
+def load_stimulus_table(
+    metadata_path="tones/tones_metadata.csv",
+    phon_levels=PHON_LEVELS,
+    cache_path=None,
+    a=0.34,
+    b=111.8,
+    standard="2023",
+    mirror=0,
+    calibration=None,
+):
+    """
+    Stimulus table for metadata_path, loaded from its cache file when still valid.
+
+    Parameters:
+    metadata_path : str, optional
+        CSV with columns Filename,Frequency.
+    phon_levels : array-like, optional
+        Phon levels to tabulate (default 0-100 phon in 1 phon steps).
+    cache_path : str, optional
+        Cache file (default: the CSV path with extension .contours.npz).
+    a, b, standard, mirror, calibration :
+        Passed to normalize_loudness_direct.
+
+    Returns:
+    StimulusTable
+    """
+    if cache_path is None:
+        cache_path = os.path.splitext(metadata_path)[0] + ".contours.npz"
+    key = _table_key(metadata_path, phon_levels, a, b, standard, mirror, calibration)
+
+    if os.path.exists(cache_path):
+        table, cached_key = StimulusTable.load(cache_path)
+        if cached_key == key:
+            return table
+
+    table = build_stimulus_table(
+        metadata_path, phon_levels, a, b, standard, mirror, calibration
+    )
+    table.save(cache_path, key)
+    return table
+
+
+if __name__ == "__main__":
+    metadata = sys.argv[1] if len(sys.argv) > 1 else "tones/tones_metadata.csv"
+    stimuli = load_stimulus_table(metadata)
+    for filename in stimuli.filenames:
+        print(
+            f"{filename:12s} {stimuli.frequency(filename):8.1f} Hz",
+            f"60 phon: {stimuli.spl(filename, 60):6.1f} dB SPL,",
+            f"volume {stimuli.volume(filename, 60):.4f}",
+        )
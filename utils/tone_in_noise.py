@@ -0,0 +1,136 @@
+"""
+Vectorized tone-in-noise mixing for detection and masking experiments.
+
+ToneInNoiseMixer computes the RMS of every tone once, plus a running sum of
+squares over the masker, so the RMS of any noise segment is two lookups.
+mix cuts N noise segments and adds N tones at N signal-to-noise ratios
+straight into one preallocated (N x samples) float32 array, one row per
+trial; the only other array of that size is a reused tone scratch buffer.
+
+SNR is the ratio of tone RMS to noise-segment RMS, both taken over the tone
+duration (the tone RMS includes its onset and offset ramps).
+"""
+
+import sys
+import time
+
+import numpy as np
+
+
+class ToneInNoiseMixer:
+    """
+    Mixes tones into random segments of a masker.
+
+    Parameters:
+    tones : array-like
+        Tone buffers, shape (n_tones, n_samples), at the masker's sample rate.
+    noise : array-like
+        Mono masker samples, at least n_samples long.
+    fs : int, optional
+        Sample rate of tones and noise in Hz.
+    """
+
+    def __init__(self, tones, noise, fs=48000):
+        self.tones = np.asarray(tones, dtype=np.float32)
+        self.noise = np.asarray(noise, dtype=np.float32)
+        self.fs = fs
+        self.n_samples = self.tones.shape[1]
+        assert len(self.noise) >= self.n_samples, "Masker is shorter than the tones."
+
+        self.tone_rms = np.sqrt(np.mean(self.tones.astype(float) ** 2, axis=1))
+        # energy[i] = sum of noise[:i] ** 2, so a segment's energy is a difference
+        self._energy = np.concatenate([[0.0], np.cumsum(self.noise.astype(float) ** 2)])
+        self.n_starts = len(self.noise) - self.n_samples + 1
+        self._scratch = np.empty((0, self.n_samples), dtype=np.float32)
+
+    @classmethod
+    def from_files(
+        cls,
+        noise_path="tones/noise.wav",
+        metadata_path="tones/tones_metadata.csv",
+        fs=48000,
+    ):
+        """Mixer for the synthesized tones of a metadata CSV and a masker file resampled to fs."""
+        from resample_cache import load_resampled
+        from tone_synth import tone_bank_from_metadata
+
+        _, _, tones = tone_bank_from_metadata(metadata_path, fs=fs)
+        noise = load_resampled(noise_path, fs)
+        return cls(tones, noise if noise.ndim == 1 else noise.mean(axis=1), fs)
+
+    def segment_rms(self, starts):
+        """RMS of the tone-length noise segments beginning at starts."""
+        starts = np.asarray(starts)
+        energy = self._energy[starts + self.n_samples] - self._energy[starts]
+        return np.sqrt(np.maximum(energy, 0) / self.n_samples)
+
+    def mix(
+        self, tone_indices, snr_db, noise_rms=None, starts=None, rng=None, out=None
+    ):
+        """
+        Trial buffers with tone tone_indices[i] in a noise segment at snr_db[i].
+
+        Parameters:
+        tone_indices : array-like of int
+            Tone (row of tones) for each trial.
+        snr_db : float or array-like
+            Signal-to-noise ratio in dB, for all trials or one per trial.
+        noise_rms : float, optional
+            Rescale every noise segment to this RMS; by default the segments
+            keep the masker's level.
+        starts : array-like of int, optional
+            Segment start samples; random (from rng) when omitted.
+        rng : numpy.random.Generator, optional
+            Random generator for the segment starts.
+        out : numpy.ndarray, optional
+            float32 array of shape (N, n_samples) to write the trials into.
+
+        Returns:
+        out : numpy.ndarray
+            The trials, one row each.
+        starts : numpy.ndarray
+            Segment start of each trial.
+        """
+        tone_indices = np.asarray(tone_indices)
+        n_trials = len(tone_indices)
+        assert np.all(
+            (tone_indices >= 0) & (tone_indices < len(self.tones))
+        ), "Tone index out of range."
+        if starts is None:
+            rng = np.random.default_rng() if rng is None else rng
+            starts = rng.integers(0, self.n_starts, n_trials)
+        starts = np.asarray(starts)
+        if out is None:
+            out = np.empty((n_trials, self.n_samples), dtype=np.float32)
+        if len(self._scratch) < n_trials:
+            self._scratch = np.empty((n_trials, self.n_samples), dtype=np.float32)
+        scratch = self._scratch[:n_trials]
+
+        segment_rms = self.segment_rms(starts)
+        noise_gain = 1.0 if noise_rms is None else noise_rms / segment_rms
+        noise_level = segment_rms * noise_gain
+        tone_gain = noise_level * 10 ** (np.asarray(snr_db) / 20)
+        tone_gain = tone_gain / self.tone_rms[tone_indices]
+
+        # Each segment is a contiguous slice of the masker, scaled straight
+        # into its row: no (N x samples) gather temporary
+        noise_gain = np.broadcast_to(np.float32(1) * noise_gain, (n_trials,))
+        for row, (start, gain) in enumerate(zip(starts, noise_gain)):
+            np.multiply(self.noise[start : start + self.n_samples], gain, out=out[row])
+        # mode="raise" (the default) would gather into a temporary before out
+        np.take(self.tones, tone_indices, axis=0, out=scratch, mode="clip")
+        scratch *= tone_gain[:, np.newaxis].astype(np.float32)
+        out += scratch
+        return out, starts
+
+
+if __name__ == "__main__":
+    n_trials = int(sys.argv[1]) if len(sys.argv) > 1 else 1000
+    mixer = ToneInNoiseMixer.from_files()
+    generator = np.random.default_rng(0)
+    indices = generator.integers(0, len(mixer.tones), n_trials)
+    snrs = generator.uniform(-20, 0, n_trials)
+    start_time = time.perf_counter()
+    trials, _ = mixer.mix(indices, snrs, noise_rms=0.05, rng=generator)
+    elapsed = time.perf_counter() - start_time
+    print(f"{n_trials} trials of {trials.shape[1]} samples in {elapsed * 1e3:.1f} ms")
@@ -0,0 +1,144 @@
+"""
+In-memory pure-tone synthesizer for the stimuli in tones/.
+
+The tone files are 50 ms sines at 48 kHz that start at phase 0, with linear
+240-sample (5 ms) onset and offset ramps, at frequencies 100 Hz * 2 ** (k / 4).
+tone_bank computes the whole set in one vectorized call and caches it as
+read-only float32 rows, so a session needs neither file I/O nor per-play
+decoding. write_tone_files writes the same stimuli in the current WAV and CSV
+layout, byte-identical to the files in tones/.
+"""
+
+import csv
+import os
+import sys
+from functools import lru_cache
+
+import numpy as np
+
+from wav_io import write_wav
+
+SAMPLE_RATE = 48000
+DURATION = 0.05
+RAMP_SAMPLES = 240
+
+
+def tone_frequencies(n_tones=31, f_min=100.0, steps_per_octave=4):
+    """Frequencies f_min * 2 ** (k / steps_per_octave) for k = 0 .. n_tones - 1."""
+    # Python floats, so the values repeat tones_metadata.csv to the last digit
+    ratio = 2 ** (1 / steps_per_octave)
+    return np.array([f_min * ratio**k for k in range(n_tones)])
+
+
+def synthesize_tones(
+    frequencies,
+    fs=SAMPLE_RATE,
+    duration=DURATION,
+    ramp_samples=RAMP_SAMPLES,
+    dtype=np.float32,
+):
+    """
+    Ramped sine tones, one row per frequency.
+
+    Parameters:
+    frequencies : array-like
+        Tone frequencies in Hz.
+    fs : int, optional
+        Sample rate in Hz (default 48 kHz).
+    duration : float, optional
+        Tone duration in seconds (default 50 ms).
+    ramp_samples : int, optional
+        Length of the linear onset and offset ramps (default 240 samples).
+    dtype : numpy dtype, optional
+        Type of the returned samples (default float32).
+
+    Returns:
+    numpy.ndarray
+        Samples in [-1, 1], shape (n_tones, round(duration * fs)).
+    """
+    n_samples = int(round(duration * fs))
+    assert 2 * ramp_samples <= n_samples, "Ramps are longer than the tone."
+    t = np.arange(n_samples) / fs
+
+    envelope = np.ones(n_samples)
+    envelope[:ramp_samples] = np.linspace(0, 1, ramp_samples)
+    envelope[n_samples - ramp_samples :] = np.linspace(1, 0, ramp_samples)
+
+    frequencies = np.asarray(frequencies, dtype=float).reshape(-1, 1)
+    tones = np.sin(2 * np.pi * frequencies * t) * envelope
+    return tones.astype(dtype, copy=False)
+
+
+@lru_cache(maxsize=8)
+def _cached_tones(frequencies, fs, duration, ramp_samples):
+    tones = synthesize_tones(frequencies, fs, duration, ramp_samples)
+    tones.setflags(write=False)
+    return tones
+
+
+def tone_bank(
+    frequencies=None, fs=SAMPLE_RATE, duration=DURATION, ramp_samples=RAMP_SAMPLES
+):
+    """
+    Cached float32 tone buffers (read-only), one row per frequency.
+
+    frequencies defaults to the 31 tones of tones/tones_metadata.csv. Repeated
+    calls with the same arguments return the same array.
+    """
+    if frequencies is None:
+        frequencies = tone_frequencies()
+    key = tuple(float(f) for f in np.ravel(frequencies))
+    return _cached_tones(key, fs, duration, ramp_samples)
+
+
+def tone_bank_from_metadata(
+    metadata_path="tones/tones_metadata.csv",
+    fs=SAMPLE_RATE,
+    duration=DURATION,
+    ramp_samples=RAMP_SAMPLES,
+):
+    """File names, frequencies and cached tone buffers for the tones listed in a metadata CSV."""
+    from stimulus_table import read_tones_metadata
+
+    filenames, frequencies = read_tones_metadata(metadata_path)
+    return filenames, frequencies, tone_bank(frequencies, fs, duration, ramp_samples)
+
+
+def write_tone_files(
+    directory,
+    frequencies=None,
+    fs=SAMPLE_RATE,
+    duration=DURATION,
+    ramp_samples=RAMP_SAMPLES,
+):
+    """
+    Write tone_<k>.wav files and tones_metadata.csv in the layout of tones/.
+
+    Returns:
+    list of str
+        Paths of the written WAV files.
+    """
+    if frequencies is None:
+        frequencies = tone_frequencies()
+    # Synthesized in float64 so the 16-bit truncation matches the original files
+    tones = synthesize_tones(frequencies, fs, duration, ramp_samples, np.float64)
+
+    os.makedirs(directory, exist_ok=True)
+    paths = []
+    with open(
+        os.path.join(directory, "tones_metadata.csv"), "w", newline=""
+    ) as csv_file:
+        writer = csv.writer(csv_file, lineterminator="\n")
+        writer.writerow(["Filename", "Frequency"])
+        for k, (frequency, tone) in enumerate(zip(frequencies, tones)):
+            filename = f"tone_{k}.wav"
+            paths.append(os.path.join(directory, filename))
+            write_wav(paths[-1], tone, fs)
+            writer.writerow([filename, float(frequency)])
+    return paths
+
+
+if __name__ == "__main__":
+    output_directory = sys.argv[1] if len(sys.argv) > 1 else "tones"
+    written = write_tone_files(output_directory)
+    print(f"Wrote {len(written)} tones to {output_directory}")
@@ -12,21 +12,37 @@
 # This line recreates the sound object before each play, effectively reloading the sound.
 #
 # This approach resolves the volume decrease issue on Linux systems.
+# On Linux the default is now MixerBackend instead (audio_backend.default_backend):
+# one output stream stays open for the whole session and every play is a new
+# mixer voice rendered from the decoded samples at its gain, so no stream or
+# Sound object carries state from one play to the next
+# (benchmarks/mixer_backend_repeat.py checks the rendered output). Without
+# sounddevice it falls back to PTBBackend, which still reloads every sound.
+# SoundPool (sound_pool.py) reuses PTB Sounds instead; that it avoids the decay
+# is unverified, so it is opt-in: backend=PTBBackend(use_pool=True).
 # The root cause may be related to ALSA buffer management or its interaction with
 # pygame/PsychoPy, but the exact mechanism is not fully understood due to limited
 # familiarity with ALSA's interaction with these libraries.
+#
+# Playback goes through an audio backend (audio_backend.py); its options (sample
+# rate, device, pooling) are set on the backend object. PTBBackend (the default
+# off Linux) sets the PsychoPy audio prefs (latency mode 4, device 4, PTB) and
+# imports psychopy.sound when it is created, not when this module is imported.
+# The null and WAV sink backends run the playback logic without an audio device.
+# PsychoPy itself is imported lazily: with a clock, keyboard and wait function
+# passed in, VolumeAdjuster runs without it (benchmarks/volume_adjuster_headless.py).
 
-import platform
-from psychopy import prefs, sound, core, visual
-from psychopy.hardware import keyboard
 import os
-from typing import Dict, Optional, List
+from typing import TYPE_CHECKING, Dict, Optional, List
 import random
 
-# Set audio preferences for PsychoPy
-prefs.hardware["audioLatencyMode"] = 4  # Configure latency mode for audio
-prefs.hardware["audioDevice"] = 4  # Select audio device
-prefs.general["audioLib"] = ["ptb"]  # Use Psychtoolbox for audio library
+import numpy as np
+
+from audio_backend import AudioBackend, default_backend
+from stimulus_table import StimulusTable
+
+if TYPE_CHECKING:
+    from psychopy import visual
 
 
 class VolumeAdjuster:
@@ -42,9 +58,24 @@ class VolumeAdjuster:
         slider_style: str = "rating",
         lang: str = "en",
         shuffle: bool = True,
+        stimulus_table: Optional[StimulusTable] = None,
+        model_phon: Optional[float] = None,
+        sound_buffers: Optional[Dict[str, np.ndarray]] = None,
+        backend: Optional[AudioBackend] = None,
+        clock=None,
+        kb=None,
+        wait=None,
     ):
-        self.is_windows = platform.system() == "Windows"  # Check if running on Windows
-        self.sounds_dict = self._load_sounds(sound_files, sound_dir)
+        # Mixer stream on Linux, PsychoPy/PTB elsewhere, at 48 kHz
+        self.backend = backend if backend is not None else default_backend()
+        # In-memory buffers (e.g. from tone_synth.tone_bank) replace the files;
+        # they must be at the backend's sample rate
+        self.sample_rate = self.backend.sample_rate
+        self.sounds_dict = (
+            dict(sound_buffers)
+            if sound_buffers is not None
+            else self._load_sounds(sound_files, sound_dir)
+        )
         self.reference_sound_file = (
             os.path.join(sound_dir, reference_sound_file)
             if reference_sound_file
@@ -55,34 +86,58 @@ class VolumeAdjuster:
         self.repeat_time = 1 / repeat_rate
         self.start_value = start_value
         self.slider_style = slider_style
-        self.clock = core.Clock()  # Create a clock for timing
-        self.kb = keyboard.Keyboard()  # Initialize keyboard for input
+        # Clock (getTime), keyboard (getKeys, getState) and wait(seconds); PsychoPy's by default
+        if clock is None or wait is None:
+            from psychopy import core
+
+            clock = core.Clock() if clock is None else clock
+            wait = core.wait if wait is None else wait
+        if kb is None:
+            from psychopy.hardware import keyboard
+
+            kb = keyboard.Keyboard()
+        self.clock = clock  # Clock for timing
+        self.kb = kb  # Keyboard for input
+        self.wait = wait
         self.lang = lang
         self.shuffle = shuffle
+        # With a stimulus table, each sound starts at its model volume for model_phon
+        self.stimulus_table = stimulus_table
+        self.model_phon = model_phon
 
-        # Preload reference sound for Windows
-        if self.is_windows and self.reference_sound_file:
-            self.reference_sound = sound.Sound(
-                self.reference_sound_file, volume=reference_sound_volume
-            )
+        # Decode every sound (and the reference, under its path) once
+        backend_sounds = dict(self.sounds_dict)
+        if self.reference_sound_file:
+            backend_sounds[self.reference_sound_file] = self.reference_sound_file
+        self.backend.load(backend_sounds)
 
-    def _load_sounds(self, sound_files: List[str], sound_dir: str) -> Dict[str, any]:
-        # For Windows, preload sounds. For Linux, store file paths.
-        if self.is_windows:
-            return {
-                os.path.splitext(os.path.basename(f))[0]: sound.Sound(
-                    os.path.join(sound_dir, f)
-                )
-                for f in sound_files
-            }
-        else:
-            return {
-                os.path.splitext(os.path.basename(f))[0]: os.path.join(sound_dir, f)
-                for f in sound_files
-            }
-
-    def _create_instruction_text(self, win: visual.Window) -> visual.TextStim:
+    @classmethod
+    def from_catalogue(cls, catalogue, **kwargs) -> "VolumeAdjuster":
+        # Files and directory of a StimulusCatalogue, e.g. catalogue.octave_band(1000)
+        return cls(catalogue.sound_files, sound_dir=catalogue.directory, **kwargs)
+
+    def _load_sounds(self, sound_files: List[str], sound_dir: str) -> Dict[str, str]:
+        # Sound name (file name without extension) -> file path, loaded by the backend
+        return {
+            os.path.splitext(os.path.basename(f))[0]: os.path.join(sound_dir, f)
+            for f in sound_files
+        }
+
+    def _start_volume(self, sound_name: str) -> float:
+        # Model volume from the stimulus table (O(1) lookup), else the fixed start value
+        if (
+            self.stimulus_table is not None
+            and self.model_phon is not None
+            and sound_name in self.stimulus_table
+        ):
+            volume = self.stimulus_table.volume(sound_name, self.model_phon)
+            return float(min(max(volume, 0.0), 1.0))
+        return self.start_value
+
+    def _create_instruction_text(self, win: "visual.Window") -> "visual.TextStim":
         # Create instruction text based on language setting
+        from psychopy import visual
+
         if self.lang == "en":
             instructions = (
                 "Adjust the volume using UP/DOWN arrow keys or by moving the mouse.\n"
@@ -114,8 +169,12 @@ class VolumeAdjuster:
             wrapWidth=1.5,
         )
 
-    def _create_slider(self, win: visual.Window) -> visual.Slider:
-        # Create a slider for adjusting volume
+    def _create_slider(
+        self, win: "visual.Window", start_value: Optional[float] = None
+    ) -> "visual.Slider":
+        # Create a slider for adjusting volume, its marker at the starting volume
+        from psychopy import visual
+
         return visual.Slider(
             win,
             size=(1.2, 0.1),
@@ -134,7 +193,7 @@ class VolumeAdjuster:
                 "100%",
             ],
             labelHeight=0.05,
-            startValue=self.start_value,
+            startValue=self.start_value if start_value is None else start_value,
             granularity=0.001,
             ticks=[0.1, 0.2, 0.3, 0.4, 0.5, 0.6, 0.7, 0.8, 0.9, 1.0],
             fillColor="darkblue",
@@ -155,18 +214,45 @@ class VolumeAdjuster:
             last_time = self.clock.getTime() if last_key == "1" else None
         return last_key, last_time
 
-    def _update_volume(self, slider: visual.Slider) -> None:
+    def _update_volume(
+        self, slider: "visual.Slider", start_value: Optional[float] = None
+    ) -> None:
         # Adjust slider value based on key inputs
-        current_rating = slider.getRating() or self.start_value
+        current_rating = slider.getRating() or start_value or self.start_value
         if self.kb.getState("up"):
             slider.setValue(min(current_rating + self.increment_rate, 1.0))
         elif self.kb.getState("down"):
             slider.setValue(max(current_rating - self.increment_rate, 0.0))
 
+    def _play_due(
+        self,
+        last_key: Optional[str],
+        last_time: Optional[float],
+        sound_name: str,
+        volume: float,
+    ) -> Optional[float]:
+        # Play reference or current sound once repeat_time has passed; returns last_time
+        if (
+            last_key == "2"
+            and self.reference_sound_file
+            and (self.clock.getTime() - last_time) >= self.repeat_time
+        ):
+            reference_volume = self.reference_sound_volume
+            self.backend.play(
+                self.reference_sound_file,
+                1.0 if reference_volume is None else reference_volume,
+            )
+            last_time = self.clock.getTime()
+        elif last_key == "1" and (self.clock.getTime() - last_time) >= self.repeat_time:
+            self.backend.play(sound_name, volume)
+            last_time = self.clock.getTime()
+        return last_time
+
     def adjust_volume(self) -> Dict[str, float]:
         # Main loop for adjusting volume of sounds
+        from psychopy import visual
+
         win = visual.Window(fullscr=True, color="lightgray")
-        vol_slider = self._create_slider(win)
         instructions = self._create_instruction_text(win)
         current_sound_text = visual.TextStim(
             win,
@@ -181,16 +267,18 @@ class VolumeAdjuster:
         if self.shuffle:
             random.shuffle(sound_names)
         current_index = 0
-        current_sound = (
-            None
-            if not self.is_windows
-            else self.sounds_dict[sound_names[current_index]]
-        )
+        applied_volume = None
 
         slider_vol = {}
         last_key = None
         last_time = None
         total_sounds = len(self.sounds_dict)
+        start_volume = (
+            self._start_volume(sound_names[current_index])
+            if sound_names
+            else self.start_value
+        )
+        vol_slider = self._create_slider(win, start_volume)
 
         while current_index < len(self.sounds_dict):
             current_sound_text.text = (
@@ -205,11 +293,13 @@ class VolumeAdjuster:
             if self.kb.getKeys(["escape"]):
                 break
 
-            self._update_volume(vol_slider)
-            current_volume = vol_slider.getRating() or self.start_value
+            self._update_volume(vol_slider, start_volume)
+            current_volume = vol_slider.getRating() or start_volume
 
-            if self.is_windows:
-                current_sound.setVolume(current_volume)
+            # Follow the slider while the current sound plays
+            if current_volume != applied_volume:
+                self.backend.set_volume(sound_names[current_index], current_volume)
+                applied_volume = current_volume
 
             keys = self.kb.getKeys(["1", "2", "space"])
             for key in keys:
@@ -221,39 +311,18 @@ class VolumeAdjuster:
                     slider_vol[sound_names[current_index]] = current_volume
                     current_index += 1
                     if current_index < len(self.sounds_dict):
-                        if self.is_windows:
-                            current_sound = self.sounds_dict[sound_names[current_index]]
+                        start_volume = self._start_volume(sound_names[current_index])
+                        # The marker starts where the sound is heard
+                        vol_slider.startValue = start_volume
                         vol_slider.reset()
 
             # Play reference or current sound based on key press
-            if (
-                last_key == "2"
-                and self.reference_sound_file
-                and (self.clock.getTime() - last_time) >= self.repeat_time
-            ):
-                if self.is_windows:
-                    self.reference_sound.play()
-                else:
-                    reference_sound = sound.Sound(
-                        self.reference_sound_file, volume=self.reference_sound_volume
-                    )
-                    reference_sound.play()
-                last_time = self.clock.getTime()
-            elif (
-                last_key == "1"
-                and (self.clock.getTime() - last_time) >= self.repeat_time
-            ):
-                if self.is_windows:
-                    current_sound.play()
-                else:
-                    temp_sound = sound.Sound(
-                        self.sounds_dict[sound_names[current_index]],
-                        volume=current_volume,
-                    )
-                    temp_sound.play()
-                last_time = self.clock.getTime()
+            if current_index < len(self.sounds_dict):
+                last_time = self._play_due(
+                    last_key, last_time, sound_names[current_index], current_volume
+                )
 
-            core.wait(0.01)  # Short wait to reduce CPU usage
+            self.wait(0.01)  # Short wait to reduce CPU usage
 
         win.close()
         return slider_vol
@@ -261,13 +330,8 @@ class VolumeAdjuster:
     def play_adjusted_sounds(self, adjusted_volumes: Dict[str, float]) -> None:
         # Play sounds with adjusted volumes
         for sound_name, volume in adjusted_volumes.items():
-            if self.is_windows:
-                self.sounds_dict[sound_name].setVolume(volume)
-                self.sounds_dict[sound_name].play()
-            else:
-                temp_sound = sound.Sound(self.sounds_dict[sound_name], volume=volume)
-                temp_sound.play()
-            core.wait(1)  # Wait to ensure sound playback is heard
+            self.backend.play(sound_name, volume)
+            self.wait(1)  # Wait to ensure sound playback is heard
 
 
 def main():
@@ -290,6 +354,7 @@ def main():
     # Adjust volumes and store the results
     adjusted_volumes = adjuster.adjust_volume()
     adjuster.play_adjusted_sounds(adjusted_volumes)
+    adjuster.backend.close()
     print("Adjusted volumes:", adjusted_volumes)
 
 
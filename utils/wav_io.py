@@ -0,0 +1,166 @@
+"""
+WAV file input/output with NumPy buffers (PCM, standard library wave module).
+
+Samples are float arrays scaled to [-1, 1): shape (n,) for mono files and
+(n, channels) otherwise. write_wav scales by 32767 and truncates towards zero,
+which is how the tone files in tones/ were written, so a synthesized tone
+written back is byte-identical to the original file.
+
+MappedWav memory-maps the data chunk of a long file (e.g. a masker), so
+segments are views into the page cache. Only the segment that is converted
+to float is ever touched.
+"""
+
+import struct
+import wave
+
+import numpy as np
+
+# Sample width in bytes -> little-endian PCM dtype
+PCM_DTYPES = {2: "<i2", 4: "<i4"}
+
+
+def read_wav(path, dtype=np.float32):
+    """
+    Read a 16- or 32-bit PCM WAV file.
+
+    Parameters:
+    path : str
+        WAV file.
+    dtype : numpy dtype, optional
+        Float type of the returned samples (default float32).
+
+    Returns:
+    samples : numpy.ndarray
+        Samples in [-1, 1), shape (n,) or (n, channels).
+    fs : int
+        Sample rate in Hz.
+    """
+    with wave.open(path, "rb") as wav_file:
+        width = wav_file.getsampwidth()
+        assert width in PCM_DTYPES, f"Unsupported sample width: {8 * width} bit."
+        fs = wav_file.getframerate()
+        channels = wav_file.getnchannels()
+        data = np.frombuffer(
+            wav_file.readframes(wav_file.getnframes()), dtype=PCM_DTYPES[width]
+        )
+    samples = data.astype(dtype)
+    samples *= 1 / 2 ** (8 * width - 1)
+    if channels > 1:
+        samples = samples.reshape(-1, channels)
+    return samples, fs
+
+
+def write_wav(path, samples, fs):
+    """
+    Write float samples in [-1, 1] as a 16-bit PCM WAV file.
+
+    Parameters:
+    path : str
+        Output file.
+    samples : array-like
+        Shape (n,) for mono or (n, channels).
+    fs : int
+        Sample rate in Hz.
+    """
+    samples = np.asarray(samples, dtype=float)
+    channels = 1 if samples.ndim == 1 else samples.shape[1]
+    pcm = (np.clip(samples, -1.0, 1.0) * 32767).astype("<i2")
+    with wave.open(path, "wb") as wav_file:
+        wav_file.setnchannels(channels)
+        wav_file.setsampwidth(2)
+        wav_file.setframerate(int(fs))
+        wav_file.writeframes(pcm.tobytes())
+
+
+# WAVE format tags
+WAVE_FORMAT_PCM = 1
+WAVE_FORMAT_IEEE_FLOAT = 3
+WAVE_FORMAT_EXTENSIBLE = 0xFFFE
+
+
+def _parse_riff(path):
+    # Format fields and (offset, size) of the data chunk, walking the RIFF chunk list
+    with open(path, "rb") as wav_file:
+        riff, _, wave_id = struct.unpack("<4sI4s", wav_file.read(12))
+        assert riff == b"RIFF" and wave_id == b"WAVE", f"Not a WAV file: {path}"
+        file_size = wav_file.seek(0, 2)
+        position = 12
+        fmt = None
+        while position + 8 <= file_size:
+            wav_file.seek(position)
+            chunk_id, chunk_size = struct.unpack("<4sI", wav_file.read(8))
+            if chunk_id == b"fmt ":
+                fields = wav_file.read(min(chunk_size, 26))
+                fmt = struct.unpack("<HHIIHH", fields[:16])
+                if fmt[0] == WAVE_FORMAT_EXTENSIBLE and len(fields) >= 26:
+                    # The actual format is the first two bytes of the sub-format GUID
+                    fmt = (struct.unpack("<H", fields[24:26])[0],) + fmt[1:]
+            elif chunk_id == b"data":
+                assert fmt is not None, f"Data chunk before fmt chunk in {path}"
+                # Truncated files: map only what is there
+                return fmt, position + 8, min(chunk_size, file_size - position - 8)
+            # Chunks are padded to an even size
+            position += 8 + chunk_size + (chunk_size & 1)
+    raise ValueError(f"No data chunk in {path}")
+
+
+class MappedWav:
+    """
+    Memory-mapped WAV file with zero-copy segment access.
+
+    Supports 16- and 32-bit integer PCM and 32-bit float data.
+
+    Parameters:
+    path : str
+        WAV file.
+    """
+
+    def __init__(self, path):
+        fmt, offset, size = _parse_riff(path)
+        format_tag, self.channels, self.fs, _, block_align, bits = fmt
+        if format_tag == WAVE_FORMAT_IEEE_FLOAT and bits == 32:
+            dtype, self._scale = np.dtype("<f4"), 1.0
+        elif format_tag == WAVE_FORMAT_PCM and bits // 8 in PCM_DTYPES:
+            dtype, self._scale = np.dtype(PCM_DTYPES[bits // 8]), 1 / 2 ** (bits - 1)
+        else:
+            raise ValueError(
+                f"Unsupported WAV format {format_tag} / {bits} bit: {path}"
+            )
+
+        self.path = path
+        self.n_frames = size // block_align
+        shape = (
+            (self.n_frames,) if self.channels == 1 else (self.n_frames, self.channels)
+        )
+        self.pcm = np.memmap(path, dtype=dtype, mode="r", offset=offset, shape=shape)
+
+    @property
+    def duration(self):
+        return self.n_frames / self.fs
+
+    def __len__(self):
+        return self.n_frames
+
+    def segment(self, start, stop):
+        """Raw samples of frames [start, stop), a view of the mapped file."""
+        return self.pcm[start:stop]
+
+    def segment_float(self, start, stop, out=None, dtype=np.float32):
+        """
+        Frames [start, stop) as floats in [-1, 1).
+
+        With out= (a float array of the segment's shape) the conversion is
+        written into it and nothing is allocated.
+        """
+        pcm = self.pcm[start:stop]
+        if out is None:
+            out = np.empty(pcm.shape, dtype=dtype)
+        return np.multiply(pcm, self._scale, out=out, casting="unsafe")
+
+    def random_segment(self, n_frames, rng=None, out=None, dtype=np.float32):
+        """A random n_frames-long segment as floats, e.g. a masker for one trial."""
+        assert n_frames <= self.n_frames, "Segment is longer than the file."
+        rng = np.random.default_rng() if rng is None else rng
+        start = int(rng.integers(0, self.n_frames - n_frames + 1))
+        return self.segment_float(start, start + n_frames, out=out, dtype=dtype)